@@ -0,0 +1,159 @@
+"""
+Build a deployable CIRCUITPY bundle with the project modules precompiled by mpy-cross,
+so the Pico doesn't compile them from source at every boot.
+
+    python build_mpy.py [--mpy-cross PATH] [--out DIR] [--micropython PATH [--hal DIR]]
+
+main.py and boot.py stay source since CircuitPython only runs them as .py files.
+--micropython imports the bundle with the stand-in hardware modules of sim_hal/. It needs the
+unix port built from the CircuitPython sources: the prebuilt lib/ .mpy files are CircuitPython
+("C") .mpy files, which a stock MicroPython can't load.
+Use the mpy-cross release that matches the CircuitPython firmware on the Pico.
+"""
+import argparse
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+# project modules imported by main.py or by each other
+MODULES = ["classes.py", "sentry.py", "actuators.py", "cmd_listener.py"]
+# copied as they are
+SOURCE_FILES = ["main.py", "boot.py", "sentry_config.json"]
+# files in lib/ that are not libraries, left out of the bundle like dotfiles are
+LIB_EXCLUDE = ["testben.py"]
+# stand-in hardware modules for running the project off the Pico
+HAL_DIR = ROOT / "sim_hal"
+
+
+def compile_module(mpy_cross, src, dst):
+    """
+    Compile a python file to .mpy
+
+    Args:
+        mpy_cross (str): mpy-cross executable
+        src (Path): python source file
+        dst (Path): .mpy file to write
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    subprocess.run([mpy_cross, "-o", str(dst), str(src)], check=True)
+
+
+def build(mpy_cross, out):
+    """
+    Write the bundle: compiled project modules, compiled lib/ sources, prebuilt lib/ .mpy files
+    and the source files
+
+    Args:
+        mpy_cross (str): mpy-cross executable
+        out (Path): bundle directory, replaced if it exists
+
+    Returns:
+        list: paths of the .mpy files written
+    """
+    if out.exists():
+        shutil.rmtree(out)
+    out.mkdir(parents=True)
+
+    compiled = []
+    for name in MODULES:
+        dst = out / Path(name).with_suffix(".mpy")
+        compile_module(mpy_cross, ROOT / name, dst)
+        compiled.append(dst)
+    for src in sorted((ROOT / "lib").rglob("*")):
+        rel = src.relative_to(ROOT / "lib")
+        if (src.is_dir() or "__pycache__" in rel.parts or rel.as_posix() in LIB_EXCLUDE
+                or any(part.startswith(".") for part in rel.parts)):
+            continue
+        dst = out / src.relative_to(ROOT)
+        if src.suffix == ".py":
+            dst = dst.with_suffix(".mpy")
+            compile_module(mpy_cross, src, dst)
+            compiled.append(dst)
+        else:
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(src, dst)
+    for name in SOURCE_FILES:
+        shutil.copy2(ROOT / name, out / name)
+    return compiled
+
+
+def check_headers(out):
+    """
+    Check every .mpy in the bundle is a .mpy file and all of them share one format,
+    a prebuilt lib from another CircuitPython release fails to import on the Pico.
+    CircuitPython .mpy files start with "C" and MicroPython ones with "M", then the version.
+
+    Args:
+        out (Path): bundle directory
+
+    Returns:
+        bool: True if the headers agree
+    """
+    formats = {}
+    for mpy in sorted(out.rglob("*.mpy")):
+        header = mpy.read_bytes()[:2]
+        if len(header) < 2 or header[:1] not in (b"C", b"M"):
+            print(f"{mpy.relative_to(out)}: not a .mpy file")
+            return False
+        mpy_format = f"{header[:1].decode()} v{header[1]}"
+        formats.setdefault(mpy_format, []).append(mpy.relative_to(out))
+    if len(formats) > 1:
+        for mpy_format, files in formats.items():
+            print(f"{mpy_format}: {', '.join(str(f) for f in files)}")
+        return False
+    return True
+
+
+def check_imports(micropython, hal, out):
+    """
+    Import the compiled project modules with a CircuitPython unix build, using a directory of
+    stand-in hardware modules (board, digitalio, pwmio, ...) for the Pico HAL and for the
+    libraries that only come as .mpy (adafruit_motor)
+
+    Args:
+        micropython (str): micropython executable of the CircuitPython unix port, same mpy
+        version as mpy-cross and the lib/ .mpy files
+        hal (Path): directory of hardware stand-in modules
+        out (Path): bundle directory
+
+    Returns:
+        bool: True if every module imported
+    """
+    # the project root comes last so simulate_pio stands in for rp2pio
+    path = [str(hal), str(out), str(out / "lib"), str(ROOT)]
+    ok = True
+    for name in MODULES:
+        module = Path(name).stem
+        code = f"import sys; sys.path[:0] = {path!r}; import {module}"
+        result = subprocess.run([micropython, "-c", code], capture_output=True, text=True)
+        if result.returncode:
+            print(f"{module}: import failed\n{result.stdout}{result.stderr}")
+            ok = False
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mpy-cross", default="mpy-cross", help="mpy-cross executable")
+    parser.add_argument("--out", default=str(ROOT / "build"), help="bundle directory")
+    parser.add_argument("--micropython",
+                        help="CircuitPython unix port executable to import the bundle with")
+    parser.add_argument("--hal", default=str(HAL_DIR),
+                        help="directory of hardware stand-in modules for --micropython")
+    args = parser.parse_args()
+
+    out = Path(args.out)
+    compiled = build(args.mpy_cross, out)
+    print(f"compiled {len(compiled)} modules into {out}")
+
+    ok = check_headers(out)
+    if args.micropython:
+        ok = check_imports(args.micropython, Path(args.hal), out) and ok
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
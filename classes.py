@@ -1,24 +1,77 @@
 """ all classes for nerf sentry project """
 import math
+import time
 import asyncio
+import struct
+import json
+from array import array
+from collections import namedtuple
 import usb_cdc
-import displayio
-import busio
 from adafruit_motor import servo
-import adafruit_displayio_ssd1306
-from adafruit_display_text import label
-import terminalio
+# the display modules (displayio, terminalio, adafruit_display_text) are slow to import,
+# Display.start imports them once the sentry is already taking commands
 import pwmio
 import board
-from digitalio import DigitalInOut, Direction
+from digitalio import DigitalInOut, Direction, Pull
+import microcontroller
 from microcontroller import Pin
+try:
+    import rp2pio
+except ImportError:
+    # not running on an RP2040, use the simulated state machine
+    import simulate_pio as rp2pio
+
+
+# board configuration, see sentry_config.json
+PinConfig = namedtuple("PinConfig", ("led", "ms1", "ms2", "ms3", "pan_step", "pan_dir", "pan_home",
+                                     "tilt_step", "tilt_dir", "tilt_home", "hold", "trigger_servo",
+                                     "flywheel_relay", "sda", "scl"))
+AxisConfig = namedtuple("AxisConfig", ("steps_per_rev", "max_speed", "limits", "decel",
+                                       "home_angle", "home_speed"))
+DisplayConfig = namedtuple("DisplayConfig", ("width", "height", "border"))
+SentryConfig = namedtuple("SentryConfig", ("pins", "pan", "tilt", "max_step_rate", "step_res",
+                                           "pio_steppers", "display"))
+
+CONFIG_FILE = "/sentry_config.json"
+
+# microcontroller.nvm layout. CIRCUITPY is read-only to code, so everything the sentry keeps
+# across resets lives here. Each record starts with a 4 byte magic, zeroed when it is stale.
+NVM_POSITION = 0         # last known axis angles, see Sentry.save_position
+NVM_SERVO_PROFILE = 16   # calibrated trigger servo timing, see ServoProfile.save
+NVM_FAULT = 64           # last task failure, see log_fault in main.py
+NVM_FAULT_SIZE = 192
+
+def load_config(path=CONFIG_FILE):
+    """
+    Parse the board configuration file and resolve its pin names on the board
+
+    Args:
+        path (str, optional): JSON config file. Defaults to CONFIG_FILE.
+
+    Returns:
+        SentryConfig: the configuration, as nested namedtuples
+    """
+    with open(path) as f:
+        raw = json.load(f)
+
+    pins = {name: None if pin is None else getattr(board, pin) for name, pin in raw["pins"].items()}
+    axes = []
+    for axis in (raw["pan"], raw["tilt"]):
+        axis = dict(axis)
+        if axis["limits"] is not None:
+            axis["limits"] = tuple(axis["limits"])
+        axes.append(AxisConfig(**axis))
+    return SentryConfig(pins=PinConfig(**pins), pan=axes[0], tilt=axes[1],
+                        max_step_rate=raw["max_step_rate"], step_res=raw["step_res"],
+                        pio_steppers=raw["pio_steppers"], display=DisplayConfig(**raw["display"]))
 
 
 class Display:
     def __init__(self, sda:Pin, scl:Pin,
                  width:int, height:int, border:int,
                  invert:bool=False) -> None:
-        """ setup OLED display
+        """ setup OLED display. The display stack is slow to import and bring up, so nothing
+        is done here until start() runs, text shown before that appears once it has.
 
         Args:
             sda (Pin): SDA pin
@@ -28,17 +81,38 @@ class Display:
             border (int): border around outside of display
             invert (bool, optional): display colors inverted. Defaults to False.
         """
+        self.sda = sda; self.scl = scl
+        self.WIDTH = width; self.HEIGHT = height; self.BORDER = border
+        self.display = None
+        self._pending_text = None
+
+    async def start(self):
+        """
+        Import the display modules and bring up the OLED, yielding to the other tasks between stages
+        """
+        global displayio, label, terminalio
+        import displayio
+        import busio
+        await asyncio.sleep(0)
+        import adafruit_displayio_ssd1306
+        await asyncio.sleep(0)
+        from adafruit_display_text import label
+        import terminalio
+        await asyncio.sleep(0)
+
         # free up all pins that may have previously been used for displays
         displayio.release_displays()
 
         # Use for I2C
-        i2c = busio.I2C(scl=scl, sda=sda); display_bus = displayio.I2CDisplay(i2c, device_address=0x3C)
+        i2c = busio.I2C(scl=self.scl, sda=self.sda); display_bus = displayio.I2CDisplay(i2c, device_address=0x3C)
 
         # setup display object
-        self.WIDTH = width; self.HEIGHT = height; self.BORDER = border
         self.display = adafruit_displayio_ssd1306.SSD1306(display_bus, width=self.WIDTH, height=self.HEIGHT)
 
+        # no awaiting from here, text() can draw as soon as self.display is set
         self.setup_canvas()
+        if self._pending_text is not None:
+            self.text(self._pending_text)
 
     def setup_canvas(self):
         # Make the display context
@@ -65,6 +139,10 @@ class Display:
         self.splash.append(inner_sprite)
 
     def text(self, text):
+        if self.display is None:
+            # not started yet, show it when it is
+            self._pending_text = text
+            return
         self.clear_canvas()
         # create text object
         text_area = label.Label(
@@ -147,17 +225,72 @@ class SafetyCmd:
         return hash(self.channel)
 
 
+class LockCmd:
+    """
+    Class that represents a target lock report from the host
+    """
+
+    def __init__(self, state) -> None:
+        """
+        Args:
+            state (bool): True when the host has locked on to a target, False when it lost it
+        """
+        self.state = state
+        self.channel = "lock"
+
+    def __repr__(self):
+        return f"Lock Command with state {self.state}"
+
+    def __eq__(self, other) : 
+        return self.channel == other.channel
+    
+    def __hash__(self):
+        return hash(self.channel)
+
+
+class CalibrateCmd:
+    """
+    Class that represents a trigger servo calibration command
+    """
+
+    def __init__(self, supply_volts, sec_per_60=None) -> None:
+        """
+        Args:
+            supply_volts (float): measured servo supply voltage
+            sec_per_60 (float, optional): measured time for the loaded servo to travel 60 deg in s.
+            Defaults to None, estimate it from the supply voltage.
+        """
+        self.supply_volts = supply_volts
+        self.sec_per_60 = sec_per_60
+        self.channel = "calibrate"
+
+    def __repr__(self):
+        return f"Calibrate Command with supply {self.supply_volts} V"
+
+    def __eq__(self, other) : 
+        return self.channel == other.channel
+    
+    def __hash__(self):
+        return hash(self.channel)
+
+
 class FireCmd:
     """
     Class that represents a fire command for the sentry trigger.
     """
 
-    def __init__(self, state) -> None:
+    def __init__(self, state, count=1) -> None:
+        """
+        Args:
+            state (bool): True to fire
+            count (int, optional): number of darts to fire in a burst. Defaults to 1.
+        """
         self.state = state
+        self.count = count
         self.channel = "trigger"
 
     def __repr__(self):
-        return "Fire Command"
+        return f"Fire Command with count {self.count}"
 
     def __eq__(self, other) : 
         return self.channel == other.channel
@@ -179,7 +312,9 @@ class SerialParser:
             "SET":   ["PAN", "TILT"],
             "SPIN":   ["UP", "DOWN"],
             "SAFETY": ["ON", "OFF"],
-            "FIRE":   []
+            "LOCK":   ["ON", "OFF"],
+            "FIRE":   [],
+            "CALIBRATE": []
         }
 
         # setup serial connection
@@ -209,6 +344,15 @@ class SerialParser:
         Get a line from the serial connection
         """
         return self.cmd_serial.readline()[:-1].decode("utf-8")
+
+    def send_line(self, line):
+        """
+        Send a line to the host over the serial connection
+
+        Args:
+            line (string): 1-line message to send, no return character
+        """
+        self.cmd_serial.write(bytes(line + "\n", "utf-8"))
     
     def get_op_control_cmds(self):
         """
@@ -293,7 +437,9 @@ class SerialParser:
                                       # ["SET", "PAN" "X.XX"] / ["SET", "TILT", "X.XX"]
                                       # ["SPIN", "UP"] / ["SPIN", "DOWN"]
                                       # ["SAFETY", "ON"] / ["SAFTEY", "OFF"]
-                                      # ["FIRE"]
+                                      # ["LOCK", "ON"] / ["LOCK", "OFF"]
+                                      # ["FIRE"] / ["FIRE", "N"]
+                                      # ["CALIBRATE", "V.VV"] / ["CALIBRATE", "V.VV", "S.SS"]
             
             if cmd_args[0] == "SET":
                 # This is a stepper movement command
@@ -313,10 +459,8 @@ class SerialParser:
             elif cmd_args[0] == "SPIN":
                 # This is a flywheel spin command
                 if cmd_args[1] == "UP":
-                    # TODO: Spin flywheels up
                     return [SpinCmd(True)]
                 elif cmd_args[1] == "DOWN":
-                    # TODO: Spin flywheels down
                     return [SpinCmd(False)]
                 else:
                     # invalid command
@@ -334,8 +478,34 @@ class SerialParser:
                     display.text("INVALID SAFETY")
                     raise(ValueError("Invalid SAFETY command"))
                     return
+            elif cmd_args[0] == "LOCK":
+                if cmd_args[1] == "ON":
+                    # The host is tracking a target, a fire command is likely
+                    return [LockCmd(True)]
+                elif cmd_args[1] == "OFF":
+                    return [LockCmd(False)]
+                else:
+                    # invalid command
+                    display.text("INVALID LOCK")
+                    raise(ValueError("Invalid LOCK command"))
             elif cmd_args[0] == "FIRE":
+                if len(cmd_args) > 1:
+                    # This is a burst of N darts
+                    count = int(cmd_args[1])
+                    if count < 1:
+                        # invalid command
+                        display.text("INVALID FIRE")
+                        raise(ValueError("Invalid FIRE count"))
+                    return [FireCmd(True, count)]
                 return [FireCmd(True)]
+            elif cmd_args[0] == "CALIBRATE":
+                # servo supply voltage, then optionally the measured transit time per 60 deg
+                values = [float(arg) for arg in cmd_args[1:3]]
+                if not values or min(values) <= 0:
+                    # invalid command
+                    display.text("INVALID CALIBRATE")
+                    raise(ValueError("Invalid CALIBRATE command"))
+                return [CalibrateCmd(*values)]
             else:
                 # invalid command
                     display.text("INVALID COMMAND")
@@ -348,69 +518,351 @@ class Sentry:
     Object that represents all of the actuators in the NERF sentry turret
     """
 
-    def __init__(self, step_res = [1, 1, 1]):
+    # finer resolutions are only switched to below this fraction of the step ceiling,
+    # so speeds close to a boundary don't flip back and forth between two resolutions
+    STEP_RES_HYSTERESIS = 0.8
+
+    # last known axis angles are kept in nvm so a warm boot can skip homing
+    POSITION_FORMAT = "<4sff"
+    POSITION_MAGIC = b"NSPT"
+    POSITION_SAVE_DELAY = 30     # seconds both axes have to be still before their angles are saved
+    POSITION_SAVE_INTERVAL = 300 # least seconds between two saves by run_position_saver
+
+    def __init__(self, config=None):
         """
         Initialize all control objects and move them to their correct positions
+
+        Args:
+            config (SentryConfig, optional): board configuration. Defaults to loading CONFIG_FILE.
         """
-        # define pins on the Raspberry Pi Pico
-        self.MS1 = board.GP20
-        self.MS2 = board.GP21
-        self.MS3 = board.GP22
-        self.PAN_STP = board.GP17
-        self.PAN_DIR = board.GP16
-        self.TILT_STP = board.GP13
-        self.TILT_DIR = board.GP12
-        self.HOLD = board.GP11
-        self.TRIGGER_SERVO = board.GP15
-        self.FLYWHEEL_RELAY = board.GP28
-        self.SDA = board.GP26
-        self.SCL = board.GP27
+        # pins, axis parameters and display size of this turret
+        if config is None:
+            config = load_config()
+        self.config = config
+        pins = config.pins
 
         # setup board led
-        self.led = DigitalInOut(board.LED)
+        self.led = DigitalInOut(pins.led)
         self.led.direction = Direction.OUTPUT
 
         # setuo microstep config pins for the A4988 stepper driver
-        self.ms1 = DigitalInOut(self.MS1)
+        self.ms1 = DigitalInOut(pins.ms1)
         self.ms1.direction = Direction.OUTPUT  # ms1 (microstep config) pin
-        self.ms2 = DigitalInOut(self.MS2)
+        self.ms2 = DigitalInOut(pins.ms2)
         self.ms2.direction = Direction.OUTPUT  # ms2 (microstep config) pin
-        self.ms3 = DigitalInOut(self.MS3)
+        self.ms3 = DigitalInOut(pins.ms3)
         self.ms3.direction = Direction.OUTPUT  # ms3 (microstep config) pin
-
-        # set microstep config
-        self.set_step_res(microsteps[1/16])
+        self.ms_pins = (self.ms1, self.ms2, self.ms3)
 
         # setup motor control objects
         # stepper that moves pan  channel
-        self.pan_stepper = Stepper(4950, self.PAN_STP,  self.PAN_DIR)
+        self.pan_stepper = self._make_stepper(config.pan, pins.pan_step, pins.pan_dir, pins.pan_home)
         # stepper that moves tilt channel
-        self.tilt_stepper = Stepper(1694, self.TILT_STP, self.TILT_DIR)
+        self.tilt_stepper = self._make_stepper(config.tilt, pins.tilt_step, pins.tilt_dir, pins.tilt_home)
+
+        # set microstep config
+        self.step_res = None
+        self.set_step_res(config.step_res)
+        # pick the microstep resolution from the commanded speeds
+        self.auto_step_res = True
         # object for enabling/disabling stepper hold mode
-        self.stepper_hold = StepperHold(self.HOLD)
+        self.stepper_hold = StepperHold(pins.hold)
         # object for controlling flywheel and trigger pull
-        self.sentry_trigger = Trigger(self.TRIGGER_SERVO, self.FLYWHEEL_RELAY)
+        self.sentry_trigger = Trigger(pins.trigger_servo, pins.flywheel_relay)
 
-        # setup display
-        self.display = Display(self.SDA, self.SCL, width=128, height=32, border=0)
+        # setup display, brought up later by start_display
+        self.display = Display(pins.sda, pins.scl, width=config.display.width,
+                               height=config.display.height, border=config.display.border)
 
         # set to hold currently active commands and the tasks that are serving them
         self.cmds = set()
+        # the angles in nvm were invalidated by a move and not saved since
+        self._position_stale = False
+        # latched by halt(), commands are ignored until reset
+        self.halted = False
     
+    def _make_stepper(self, axis, step_pin, dir_pin, home_pin):
+        """
+        Create the stepper of one axis from its configuration
+
+        Args:
+            axis (AxisConfig): axis configuration
+            step_pin (board.pin): A4988 STEP pin
+            dir_pin (board.pin): A4988 DIR pin
+            home_pin (board.pin): limit switch pin, or None
+
+        Returns:
+            Stepper: the stepper
+        """
+        return Stepper(axis.steps_per_rev, step_pin, dir_pin, max_speed=axis.max_speed,
+                       pio=self.config.pio_steppers, limits=axis.limits, decel=axis.decel,
+                       home_pin=home_pin, home_angle=axis.home_angle, home_speed=axis.home_speed,
+                       max_step_rate=self.config.max_step_rate)
+
     def __del__(self):
         self.stepper_hold.toggle()
 
-    def set_step_res(self, step_res_config):
+    def safe_state(self):
+        """
+        Stop everything that moves: both step trains, the trigger servo and the flywheel.
+        Needs no event loop, so it also works after the loop has died.
+        """
+        for stepper in (self.pan_stepper, self.tilt_stepper):
+            stepper.set_speed(0)
+        self.sentry_trigger.cancel()
+        self.cmds.clear()
+        # the axes are stopped now, make the angles in nvm current again
+        if self._position_stale:
+            self.save_position()
+
+    def halt(self):
+        """
+        Go to the safe state and stay there: commands from the host are ignored from now on,
+        only a reset brings the sentry back
+        """
+        self.halted = True
+        self.safe_state()
+
+    def set_step_res(self, step_res):
+        """
+        Switch the step resolution of the stepper motors at runtime. Step output is paused
+        while the MS1-MS3 pins change so the drivers never step at an in-between resolution,
+        then both steppers resume at the same axis speed with their position counts rescaled.
+
+        Args:
+            step_res (float): fraction of a full step per STEP pulse, a key of microsteps
+        """
+        if step_res == self.step_res:
+            return
+        steppers = (self.pan_stepper, self.tilt_stepper)
+
+        # stop the step trains while the pins are between resolutions
+        for stepper in steppers:
+            stepper.driver.set_speed_pwm(0)
+
+        for pin, value in microstep_writes[step_res]:
+            self.ms_pins[pin].value = value
+        self.step_res = step_res
+
+        for stepper in steppers:
+            stepper.set_step_res(step_res)
+            stepper.set_speed(stepper.speed)
+
+    def choose_step_res(self):
+        """
+        Pick the finest microstep resolution that reaches the commanded speed of both steppers
+        without pulsing either A4988 faster than its step ceiling. The MS pins are shared, so
+        the faster axis decides for both.
+
+        Returns:
+            float: step resolution, a key of microsteps
         """
-        Switch the step resolution of the stepper motors
+        steppers = (self.pan_stepper, self.tilt_stepper)
+        for step_res in sorted(microsteps):
+            if step_res < self.step_res:
+                headroom = self.STEP_RES_HYSTERESIS
+            else:
+                headroom = 1
+            if all(stepper.full_steps_per_second / step_res <= stepper.driver.max_step_rate * headroom
+                   for stepper in steppers):
+                return step_res
+        return max(microsteps)
+
+    def set_stepper_speed(self, stepper, speed):
+        """
+        Drive a stepper at a given speed, switching the shared microstep resolution first
+        if auto_step_res is on and the new speed calls for it
+
+        Args:
+            stepper (Stepper): pan_stepper or tilt_stepper
+            speed (float): -1 to 1, multiple of max speed
+        """
+        stepper.speed = speed
+        step_res = self.choose_step_res() if self.auto_step_res else self.step_res
+        if step_res != self.step_res:
+            self.set_step_res(step_res)  # also restarts both steppers at their speeds
+        else:
+            stepper.set_speed(speed)
+
+    async def move_by(self, pan_angle, tilt_angle, speed=1, accel=None):
+        """
+        Move both axes by an angle so they start and arrive together and the aim point
+        travels in a straight line. The axis needing the longest time runs at speed and
+        the other is slowed to match it. A fast move may run at a coarse microstep resolution,
+        it stops short of the target by less than a coarse step and a short segment at the
+        configured resolution finishes it.
+
+        Args:
+            pan_angle (float): pan movement in degrees
+            tilt_angle (float): tilt movement in degrees
+            speed (float, optional): 0 to 1, multiple of max speed for the axis that takes longest. Defaults to 1.
+            accel (float, optional): acceleration of the axis that takes longest in deg/s^2, PIO driver only.
+            The other axis accelerates in proportion. Defaults to None.
+        """
+        steppers = (self.pan_stepper, self.tilt_stepper)
+        for stepper in steppers:
+            stepper.set_speed(0)
+        # stop short of the soft limits, both axes still arrive together
+        targets = [stepper.clamp_angle(stepper.angle + angle)
+                   for stepper, angle in zip(steppers, (pan_angle, tilt_angle))]
+        angles = [target - stepper.angle for stepper, target in zip(steppers, targets)]
+
+        # pick the microstep resolution for the axis speeds of the move before converting to steps
+        if self.auto_step_res:
+            durations = [abs(angle) / stepper.max_speed for stepper, angle in zip(steppers, angles)]
+            if max(durations):
+                for stepper, duration in zip(steppers, durations):
+                    stepper.speed = abs(speed) * duration / max(durations)
+                step_res = self.choose_step_res()
+                for stepper in steppers:
+                    stepper.speed = 0
+                self.set_step_res(step_res)
+
+        # whole steps towards the target only, so a coarse step never passes it or a soft limit
+        await self._move_steps(angles, speed, accel, int)
+
+        # finish at the configured resolution
+        if self.auto_step_res:
+            self.set_step_res(self.config.step_res)
+        angles = [target - stepper.angle for stepper, target in zip(steppers, targets)]
+        await self._move_steps(angles, speed, None, round)
+
+    async def _move_steps(self, angles, speed, accel, to_steps):
+        """
+        Move both axes by an angle at the current resolution, arriving together
 
         Args:
-            step_res_config (tuple of bools): values to set the
-            MS1, MS2, MS3 pins on the A4988 stepper driver board
+            angles (list): pan and tilt movement in degrees
+            speed (float): 0 to 1, multiple of max speed for the axis that takes longest
+            accel (float): acceleration of the axis that takes longest in deg/s^2, or None
+            to_steps (function): turns a fractional step count into whole steps, int or round
         """
-        self.ms1.value = step_res_config[0]
-        self.ms2.value = step_res_config[1]
-        self.ms3.value = step_res_config[2]
+        steppers = (self.pan_stepper, self.tilt_stepper)
+        # (stepper, steps, time needed at speed under the step ceiling) for the axes that move
+        axes = []
+        for stepper, angle in zip(steppers, angles):
+            n = to_steps(angle / 360 * stepper.steps_per_rev)
+            if n:
+                rate = min(stepper.driver.max_steps_per_second * abs(speed), stepper.driver.max_step_rate)
+                axes.append((stepper, n, abs(n) / rate))
+        if not axes:
+            return
+        lead_stepper, lead_steps, duration = max(axes, key=lambda axis: axis[2])
+
+        moves = []
+        for stepper, n, _ in axes:
+            axis_accel = None
+            if accel:
+                # scale with the distance so both profiles keep the same shape
+                axis_accel = accel / 360 * lead_stepper.steps_per_rev * abs(n / lead_steps)
+            axis_speed = abs(n) / duration / stepper.driver.max_steps_per_second
+            moves.append(stepper.move(n, axis_speed, axis_accel))
+        await asyncio.gather(*moves)
+
+    async def move_to(self, pan_angle, tilt_angle, speed=1, accel=None):
+        """
+        Move both axes to an angle from their zero positions, arriving together
+
+        Args:
+            pan_angle (float): pan angle in degrees
+            tilt_angle (float): tilt angle in degrees
+            speed (float, optional): 0 to 1, multiple of max speed for the axis that takes longest. Defaults to 1.
+            accel (float, optional): acceleration of the axis that takes longest in deg/s^2, PIO driver only.
+        """
+        await self.move_by(pan_angle - self.pan_stepper.angle, tilt_angle - self.tilt_stepper.angle,
+                           speed, accel)
+
+    def save_position(self):
+        """
+        Store the current pan and tilt angles in nvm for the next boot. Only call this while
+        both axes are still, a later move has to invalidate_position() first.
+        """
+        if microcontroller.nvm is None:
+            return
+        record = struct.pack(self.POSITION_FORMAT, self.POSITION_MAGIC,
+                             self.pan_stepper.angle, self.tilt_stepper.angle)
+        microcontroller.nvm[NVM_POSITION:NVM_POSITION + len(record)] = record
+        self._position_stale = False
+
+    def invalidate_position(self):
+        """
+        Mark the angles in nvm stale, so a reset during a move homes instead of trusting them
+        """
+        if microcontroller.nvm is None:
+            return
+        microcontroller.nvm[NVM_POSITION:NVM_POSITION + 4] = bytes(4)
+        self._position_stale = True
+
+    def restore_position(self):
+        """
+        Load the pan and tilt angles saved by save_position, if there are valid ones
+
+        Returns:
+            bool: True if the angles were restored and homing can be skipped
+        """
+        if microcontroller.nvm is None:
+            return False
+        size = struct.calcsize(self.POSITION_FORMAT)
+        magic, pan_angle, tilt_angle = struct.unpack(self.POSITION_FORMAT,
+                                                   microcontroller.nvm[NVM_POSITION:NVM_POSITION + size])
+        if magic != self.POSITION_MAGIC:
+            return False
+        self.pan_stepper.set_angle(pan_angle)
+        self.tilt_stepper.set_angle(tilt_angle)
+        return True
+
+    async def home(self):
+        """
+        Home the axes that have limit switches, take the current position as zero for
+        the others, then save the result
+        """
+        for stepper in (self.pan_stepper, self.tilt_stepper):
+            if stepper.home_switch is None:
+                stepper.set_angle(0)
+            else:
+                await stepper.home()
+        self.save_position()
+
+    async def run_position_saver(self, interval=0.25):
+        """
+        Keep the angles in nvm usable: invalidate them when an axis starts moving after a
+        save, and save them again once the sentry is idle, i.e. both axes have been still for
+        POSITION_SAVE_DELAY and the last save is POSITION_SAVE_INTERVAL old. safe_state() saves
+        them as well. Every nvm write erases a flash sector, which wears the flash and stalls
+        the CPU (and so the step timing) while it runs, so this allows at most one save and one
+        invalidation per POSITION_SAVE_INTERVAL however often the sentry moves.
+
+        Args:
+            interval (float, optional): time between checks in seconds. Defaults to 0.25.
+        """
+        # boot restores or homes and saves, so nvm starts out current
+        angles = (self.pan_stepper.angle, self.tilt_stepper.angle)
+        still_since = last_save = time.monotonic()
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            last_angles = angles
+            angles = (self.pan_stepper.angle, self.tilt_stepper.angle)
+            if any(abs(a - b) > 0.01 for a, b in zip(angles, last_angles)):
+                still_since = now
+                if not self._position_stale:
+                    self.invalidate_position()
+            elif (self._position_stale and now - still_since >= self.POSITION_SAVE_DELAY
+                  and now - last_save >= self.POSITION_SAVE_INTERVAL):
+                self.save_position()
+                last_save = now
+
+    async def run_limits(self, interval=0.01):
+        """
+        Keep both steppers decelerating into and stopping at their soft limits
+
+        Args:
+            interval (float, optional): time between checks in seconds. Defaults to 0.01.
+        """
+        while True:
+            self.pan_stepper.enforce_limits()
+            self.tilt_stepper.enforce_limits()
+            await asyncio.sleep(interval)
 
     async def blink_led(self, interval):
         """
@@ -425,41 +877,112 @@ class Sentry:
             self.led.value = False
             await asyncio.sleep(interval)
     
-    async def execute_cmds(self):
+    def _pending(self, cmd):
+        """
+        Find the pending command on the channel of cmd. Commands compare equal by channel,
+        so this tells cmd apart from a newer command that replaced it.
+
+        Args:
+            cmd (Cmd message): command to look up
+
+        Returns:
+            Cmd message: the pending command on its channel, or None if there is none
+        """
+        for pending in self.cmds:
+            if pending == cmd:
+                return pending
+        return None
+
+    def _retire(self, cmd):
+        """
+        Remove an executed command from the set, unless a newer one already replaced it
+
+        Args:
+            cmd (Cmd message): the executed command
+        """
+        if self._pending(cmd) is cmd:
+            self.cmds.discard(cmd)
+
+    async def execute_cmds(self, ser:SerialParser=None):
         """
         Asynchronously execute all motor commands
 
         Args:
-            cmd (Cmd message): the command to execute
+            ser (SerialParser, optional): serial parser to answer commands that report back to
+            the host, like CALIBRATE. Defaults to None, no answers.
         """
 
         # switch on command message type to execute different types of commands
         while True:
             await asyncio.sleep(0)
-            for cmd in self.cmds:
+            # the command listeners add to the set while this loop awaits
+            for cmd in list(self.cmds):
                 await asyncio.sleep(0)
+                if self.halted:
+                    break  # halt() came in while this loop awaited, drop the rest
+                if self._pending(cmd) is not cmd:
+                    continue  # a newer command replaced it on its channel, that one runs next pass
                 # print(cmd)
                 if isinstance(cmd, PanTiltCmd):
                     channel = cmd.channel
                     speed = cmd.speed
                     stepper = self.pan_stepper if channel == "pan" else self.tilt_stepper
-                    stepper.set_speed(speed)
-                    self.cmds.discard(cmd)
+                    self.set_stepper_speed(stepper, speed)
+                    self._retire(cmd)
                 elif isinstance(cmd, SpinCmd):
-                    # TODO
-                    pass
+                    self.sentry_trigger.spin(cmd.state)
+                    self._retire(cmd)
                 elif isinstance(cmd, SafetyCmd):
-                    # TODO
-                    pass
+                    self.sentry_trigger.set_safety(cmd.state)
+                    self._retire(cmd)
+                elif isinstance(cmd, LockCmd):
+                    # warm the flywheel ahead of the fire command a lock usually leads to
+                    if cmd.state:
+                        self.sentry_trigger.warm(self.sentry_trigger.LOCK_WARM_TIME)
+                    else:
+                        self.sentry_trigger.warm(self.sentry_trigger.WARM_TIME, extend=False)
+                    self._retire(cmd)
+                elif isinstance(cmd, CalibrateCmd):
+                    try:
+                        self.sentry_trigger.calibrate(cmd.supply_volts, cmd.sec_per_60)
+                        reply = f"CALIBRATE OK {self.sentry_trigger.servo_profile.sec_per_60:.3f}"
+                    except OSError as e:
+                        reply = f"CALIBRATE NOT SAVED {e}"
+                    print(reply)
+                    if ser is not None:
+                        ser.send_line(reply)
+                    self._retire(cmd)
                 elif isinstance(cmd, FireCmd):
                     if cmd.state == True:
                         print("FIRE")
-                        asyncio.create_task(self.sentry_trigger.fire())
-                        self.cmds.discard(cmd)
+                        self.sentry_trigger.fire(cmd.count)
+                    self._retire(cmd)
                         # await asyncio.gather(firetask)
                         # await asyncio.sleep(0)
                         # firetask.cancel()
 
+    def add_cmd(self, cmd):
+        """
+        Add a command to the set of active commands, replacing the pending one on its channel.
+        Fire commands add up instead, so every FIRE that arrives before execution is fired.
+        Nothing is added once the sentry is halted.
+
+        Args:
+            cmd (Cmd message): the command to add
+        """
+        if self.halted:
+            return
+        if isinstance(cmd, FireCmd):
+            if cmd.state and cmd.count < 1:
+                return
+            for pending in self.cmds:
+                if pending == cmd and pending.state:
+                    if cmd.state:
+                        pending.count += cmd.count
+                    return
+        self.cmds.discard(cmd)
+        self.cmds.add(cmd)
+
     async def run_op_control(self, ser):
         """
         Handles getting commands from serial parser and passing them to the execution method
@@ -478,30 +1001,32 @@ class Sentry:
                 # update command set
                 for cmd in input_cmds:
                     await asyncio.sleep(0)
-                    self.cmds.discard(cmd)
-                    self.cmds.add(cmd)
+                    self.add_cmd(cmd)
 
                 print(self.cmds)
     
-    async def run_targeting(self, ser:SerialParser):
+    async def run_targeting(self, ser:SerialParser, healthy=None):
         """
         Handles getting targeting commands from serial parser and passing them to the execution method
 
         Args:
             ser (SerialParser): serial parser for the command stream
+            healthy (function, optional): called after every line that parsed, tells the supervisor
+            the listener works. Defaults to None.
         """
         while True:
             await asyncio.sleep(0)
             input_cmds = ser.get_targeting_cmds(self.display)
             if input_cmds:
+                if healthy:
+                    healthy()
                 # async sleep to hopefully make shit work?
                 await asyncio.sleep(0)
 
                 # update command set
                 for cmd in input_cmds:
                     # await asyncio.sleep(0)
-                    self.cmds.discard(cmd)
-                    self.cmds.add(cmd)
+                    self.add_cmd(cmd)
 
                 print(self.cmds)
 
@@ -513,8 +1038,28 @@ microsteps = {
     1/16: [1,1, 1],
 }
 
+def _safe_write_order(step_res_config):
+    """
+    Order the MS1-MS3 pin writes for a resolution so no intermediate state is invalid.
+    The A4988 only accepts MS3 high together with MS1 and MS2, so MS3 is cleared first or set last.
+
+    Args:
+        step_res_config (list): MS1, MS2, MS3 pin values
+
+    Returns:
+        tuple: (pin index, value) pairs in write order
+    """
+    ms1, ms2, ms3 = (bool(value) for value in step_res_config)
+    if ms3:
+        return ((0, ms1), (1, ms2), (2, ms3))
+    return ((2, ms3), (0, ms1), (1, ms2))
+
+# precompiled pin writes for each step resolution
+microstep_writes = {step_res: _safe_write_order(config) for step_res, config in microsteps.items()}
+
 class A4988:
-    def __init__(self, DIR:Pin, STEP:Pin, max_steps_per_second:int=2156):
+    def __init__(self, DIR:Pin, STEP:Pin, max_steps_per_second:int=2156, max_step_rate:int=2156,
+                 min_freq_change:float=0.02):
         """
         This class represents an A4988 stepper motor driver.  It uses two output pins
         for direction and step control signals.
@@ -522,16 +1067,63 @@ class A4988:
         Args:
             DIR (Pin): pin on board connected to A4988 DIR pin
             STEP (Pin): pin on board connected to A4988 STEP pin
-            max_speed (int): max speed of 
+            max_steps_per_second (int): step rate at full speed (speed = 1), at the current microstep resolution
+            max_step_rate (int): highest STEP pulse frequency the driver is ever run at
+            min_freq_change (float): smallest change of the step frequency, as a fraction of the
+            running frequency, that is written to the PWM. Defaults to 0.02.
         """
         # This class represents an A4988 stepper motor driver.  It uses two output pins
         # for direction and step control signals.
         self.max_steps_per_second = max_steps_per_second
+        self.max_step_rate = max_step_rate
+        self.min_freq_change = min_freq_change
 
         # setup pins
         self._dir  = DigitalInOut(DIR); self._dir.direction  = Direction.OUTPUT
         self._step = pwmio.PWMOut(STEP, variable_frequency=True)
-        
+
+        # last values written to the hardware, so unchanged writes can be skipped.
+        # frequency writes recompute the PWM dividers and can glitch the step train
+        self._dir_value = None
+        self._duty_cycle = 0
+        self._frequency = 0
+
+        # step count bookkeeping, the PWM runs on its own so steps are counted from its rate
+        self._steps = 0.0          # steps moved up to _last_update
+        self._rate = 0             # signed steps per second being output
+        self._last_update = time.monotonic_ns()
+
+    @property
+    def steps(self):
+        """
+        Estimated number of steps moved since startup, positive in the DIR high direction
+        """
+        return self._steps + self._rate * (time.monotonic_ns() - self._last_update) / 1e9
+
+    def _set_rate(self, rate):
+        """
+        Bank the steps made at the old rate and start counting at a new one
+
+        Args:
+            rate (float): signed steps per second now being output
+        """
+        now = time.monotonic_ns()
+        self._steps += self._rate * (now - self._last_update) / 1e9
+        self._rate = rate
+        self._last_update = now
+
+    def rescale(self, factor):
+        """
+        Rescale step bookkeeping after the microstep resolution changed, so the step count and
+        max_steps_per_second keep describing the same motor motion
+
+        Args:
+            factor (float): new steps per old step
+        """
+        self._set_rate(self._rate * factor)
+        self._steps *= factor
+        self.max_steps_per_second *= factor
+
     def set_speed_pwm(self, speed):
         """
         Set the driver to run its stepper motor indefinitely at a given speed
@@ -539,20 +1131,51 @@ class A4988:
         Args:
             speed (float): ranges from -1 to +1. Fraction of the max speed to drive at
         """
-        if speed == 0: # stop the driver and return if speed is 0
-            self._step.duty_cycle = 0
+        f = math.floor(self.max_steps_per_second * abs(speed))  # calculate pwm frequency as percentage of maximum
+        f = min(f, self.max_step_rate)     # never pulse faster than the step ceiling
+        if f == 0: # stop the driver and return if speed is 0
+            if self._duty_cycle:
+                self._step.duty_cycle = 0
+                self._duty_cycle = 0
+                self._set_rate(0)
             return
-        else: # determine step PWM freqeuncy and set the driver in motion
+        else: # set the driver in motion
             # flip direction of movement if necessary
-            if speed < 0:
-                self._dir.value = False
-            else:
-                self._dir.value = True
-            
-            self._step.duty_cycle = 65535 // 2 # set duty cycle to 1/2
+            dir_value = speed > 0
+            if dir_value != self._dir_value:
+                self._dir.value = dir_value
+                self._dir_value = dir_value
 
-            f = math.floor(self.max_steps_per_second * abs(speed))  # calculate pwm frequency as percentage of maximum
-            self._step.frequency = f           # set pwm frequency of step pin
+            # set pwm frequency of step pin, unless it's within min_freq_change of the running one
+            if not self._duty_cycle or abs(f - self._frequency) > self._frequency * self.min_freq_change:
+                self._step.frequency = f
+                self._frequency = f
+
+            if not self._duty_cycle:
+                self._step.duty_cycle = 65535 // 2 # set duty cycle to 1/2
+                self._duty_cycle = 65535 // 2
+
+            rate = self._frequency if dir_value else -self._frequency
+            if rate != self._rate:
+                self._set_rate(rate)
+
+    async def move(self, steps, speed=1, accel=None):
+        """
+        Move a number of steps and stop. The PWM can't count pulses, so the move is timed
+        and the step count is only as exact as the event loop's sleep.
+
+        Args:
+            steps (int): signed number of steps to move
+            speed (float, optional): 0 to 1, fraction of the max speed. Defaults to 1.
+            accel (float, optional): ignored, the PWM backend has no acceleration profile
+        """
+        if steps == 0:
+            return
+        self.set_speed_pwm(abs(speed) if steps > 0 else -abs(speed))
+        if self._rate == 0:
+            return
+        await asyncio.sleep(abs(steps / self._rate))
+        self.set_speed_pwm(0)
 
     def __enter__(self):
         return self
@@ -564,8 +1187,255 @@ class A4988:
         self._dir  = None
         self._step = None
 
+class PioA4988:
+    # PIO program emitting exact step trains. For every (step count - 1, half period delay)
+    # pair in the TX FIFO it pulses STEP that many times, then pushes a report to the RX FIFO
+    # so the CPU knows the segment is done. ISR holds the report from the start of a segment
+    # until it is pushed, which tells an aborted segment that ran from one that never started.
+    # One step takes 2 * delay + 7 cycles.
+    STEP_PROGRAM = array("H", [
+        0x80A0,  # 0: pull block      ; step count - 1
+        0xA027,  # 1: mov x, osr
+        0xA0CB,  # 2: mov isr, ~null  ; segment started, pushed as the completion report
+        0x80A0,  # 3: pull block      ; half period delay
+        0xE001,  # 4: set pins, 1     ; rising edge steps the A4988
+        0xA047,  # 5: mov y, osr
+        0x0086,  # 6: jmp y--, 6
+        0xE000,  # 7: set pins, 0
+        0xA047,  # 8: mov y, osr
+        0x0089,  # 9: jmp y--, 9
+        0x0044,  # 10: jmp x--, 4
+        0x8000,  # 11: push noblock   ; report the finished segment
+    ])
+    # reads whether a segment was started and its remaining step count, leaves STEP low and
+    # empties the TX FIFO of queued segments, which restart() leaves in place
+    ABORT_PROGRAM = array("H", [
+        0x8000,  # push noblock
+        0xA0C1,  # mov isr, x
+        0x8000,  # push noblock
+        0xE000,  # set pins, 0
+        0x8080,  # pull noblock
+        0x8080,  # pull noblock
+        0x8080,  # pull noblock
+        0x8080,  # pull noblock
+    ])
+    FREQUENCY = 1_000_000   # state machine clock in Hz
+    SEGMENT_TIME = 0.01     # length of the segments streamed while running at a set speed (s)
+    QUEUE_SEGMENTS = 3      # segments in flight, one running and two filling the 4 word TX FIFO
+
+    def __init__(self, DIR:Pin, STEP:Pin, max_steps_per_second:int=2156, max_step_rate:int=2156):
+        """
+        A4988 stepper driver with STEP pulses generated by an RP2040 PIO state machine.
+        Unlike A4988 it can stop after an exact number of steps, change rate only between
+        whole steps and count every step made, without CPU time per step.
+
+        Args:
+            DIR (Pin): pin on board connected to A4988 DIR pin
+            STEP (Pin): pin on board connected to A4988 STEP pin
+            max_steps_per_second (int): step rate at full speed (speed = 1), at the current microstep resolution
+            max_step_rate (int): highest STEP pulse frequency the driver is ever run at
+        """
+        self.max_steps_per_second = max_steps_per_second
+        self.max_step_rate = max_step_rate
+
+        # setup pins
+        self._dir  = DigitalInOut(DIR); self._dir.direction  = Direction.OUTPUT
+        self._sm = rp2pio.StateMachine(self.STEP_PROGRAM, frequency=self.FREQUENCY,
+                                       first_set_pin=STEP, set_pin_count=1,
+                                       initial_set_pin_state=0, initial_set_pin_direction=1)
+
+        # step count bookkeeping, counted from the segments the state machine reports done
+        self._steps = 0            # steps completed since startup, positive in the DIR high direction
+        self._in_flight = []       # signed step counts of the segments handed to the state machine
+        self._report = array("L", [0])
+        self._abort_report = array("L", [0, 0])
+        self._generation = 0       # bumped by every abort so running moves know to give up
+
+        # speed mode
+        self._run_rate = 0         # signed steps per second streamed by _feed
+        self._feeder = None
+
+    @property
+    def steps(self):
+        """
+        Number of steps moved since startup, positive in the DIR high direction.
+        Exact, but only updated as each segment completes.
+        """
+        self._poll()
+        return self._steps
+
+    def _poll(self):
+        """
+        Count the segments the state machine has reported done
+        """
+        while self._sm.in_waiting:
+            self._sm.readinto(self._report)
+            self._steps += self._in_flight.pop(0)
+
+    def _queue(self, steps, rate):
+        """
+        Hand a segment of steps at a constant rate to the state machine
+
+        Args:
+            steps (int): signed number of steps, the sign must match DIR
+            rate (float): steps per second
+        """
+        delay = max(0, round((self.FREQUENCY / rate - 7) / 2))
+        self._sm.write(array("L", [abs(steps) - 1, delay]))
+        self._in_flight.append(steps)
+
+    def _abort(self):
+        """
+        Stop the step train immediately, dropping queued segments. The steps made by the
+        interrupted segment are read back from the state machine, to within one step.
+        """
+        self._sm.stop()
+        self._poll()
+        if self._in_flight:
+            self._sm.run(self.ABORT_PROGRAM)
+            self._sm.readinto(self._abort_report)
+            started, remaining = self._abort_report
+            steps = self._in_flight[0]
+            if not started:
+                done = 0
+            elif remaining == 0xFFFFFFFF:
+                done = abs(steps)  # X wrapped after the last step, stopped before the report
+            else:
+                done = max(0, abs(steps) - remaining)
+            self._steps += done if steps > 0 else -done
+        else:
+            self._sm.run(self.ABORT_PROGRAM[3:])
+        self._sm.restart()
+        self._sm.clear_rxfifo()
+        self._in_flight = []
+        self._generation += 1
+
+    def rescale(self, factor):
+        """
+        Rescale step bookkeeping after the microstep resolution changed, so the step count and
+        max_steps_per_second keep describing the same motor motion. The driver must be stopped.
+
+        Args:
+            factor (float): new steps per old step
+        """
+        self._poll()
+        self._steps = round(self._steps * factor)
+        self._run_rate *= factor
+        self.max_steps_per_second *= factor
+
+    def set_speed_pwm(self, speed):
+        """
+        Set the driver to run its stepper motor indefinitely at a given speed. Short segments
+        are streamed to the state machine, so a new speed starts on the next step boundary
+        within QUEUE_SEGMENTS * SEGMENT_TIME. Stopping and reversing are immediate.
+
+        Args:
+            speed (float): ranges from -1 to +1. Fraction of the max speed to drive at
+        """
+        rate = min(self.max_steps_per_second * abs(speed), self.max_step_rate)
+        rate = rate if speed > 0 else -rate
+        if rate == 0 or not self._run_rate or (rate > 0) != (self._run_rate > 0):
+            if self._in_flight:
+                self._abort()
+            self._dir.value = rate > 0
+        self._run_rate = rate
+        if rate and self._feeder is None:
+            self._feeder = asyncio.create_task(self._feed())
+
+    async def _feed(self):
+        """
+        Keep the state machine supplied with segments at the current speed until it is set to 0
+        """
+        while self._run_rate:
+            self._poll()
+            if len(self._in_flight) < self.QUEUE_SEGMENTS:
+                rate = abs(self._run_rate)
+                steps = max(1, int(rate * self.SEGMENT_TIME))
+                self._queue(steps if self._run_rate > 0 else -steps, rate)
+            await asyncio.sleep(0)
+        self._feeder = None
+
+    @staticmethod
+    def accel_table(steps, rate, accel, slice_time=0.005):
+        """
+        Split a move into constant rate segments following a trapezoidal speed profile
+
+        Args:
+            steps (int): number of steps to move
+            rate (float): cruise rate in steps per second
+            accel (float): acceleration in steps per second squared
+            slice_time (float, optional): target duration of each ramp segment (s). Defaults to 0.005.
+
+        Returns:
+            list: (steps, rate) segments adding up to exactly steps
+        """
+        ramp = []
+        ramp_steps = 0
+        ramp_rate = math.sqrt(2 * accel)
+        while ramp_rate < rate:
+            count = max(1, round(ramp_rate * slice_time))
+            if 2 * (ramp_steps + count) > steps:
+                break
+            ramp.append((count, ramp_rate))
+            ramp_steps += count
+            # constant acceleration from rest reaches sqrt(2 * accel * distance)
+            ramp_rate = math.sqrt(2 * accel * (ramp_steps + 1))
+        cruise = steps - 2 * ramp_steps
+        segments = ramp[:]
+        if cruise:
+            segments.append((cruise, min(ramp_rate, rate)))
+        segments.extend(reversed(ramp))
+        return segments
+
+    async def move(self, steps, speed=1, accel=None):
+        """
+        Move exactly a number of steps and stop
+
+        Args:
+            steps (int): signed number of steps to move
+            speed (float, optional): 0 to 1, fraction of the max speed. Defaults to 1.
+            accel (float, optional): acceleration in steps per second squared. Defaults to
+            None, which starts and stops at full rate.
+        """
+        self.set_speed_pwm(0)
+        rate = min(self.max_steps_per_second * abs(speed), self.max_step_rate)
+        if steps == 0 or rate == 0:
+            return
+        if accel:
+            segments = self.accel_table(abs(steps), rate, accel)
+        else:
+            segments = [(abs(steps), rate)]
+
+        self._dir.value = steps > 0
+        generation = self._generation
+        for count, segment_rate in segments:
+            while len(self._in_flight) >= self.QUEUE_SEGMENTS:
+                await asyncio.sleep(0)
+                if self._generation != generation:
+                    return  # interrupted by set_speed_pwm or another move
+                self._poll()
+            self._queue(count if steps > 0 else -count, segment_rate)
+        while self._in_flight:
+            await asyncio.sleep(0)
+            if self._generation != generation:
+                return
+            self._poll()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self):
+        """ Automatically deinitializes the hardware when exiting a context. """
+        self._run_rate = 0
+        self._abort()
+        self._dir.deinit()
+        self._sm.deinit()
+        self._dir = None
+        self._sm = None
+
 class Stepper:
-    def __init__(self, steps_per_rev, step_pin, direction_pin):
+    def __init__(self, steps_per_rev, step_pin, direction_pin, step_res=1/16, max_speed=None, pio=False,
+                 limits=None, decel=None, home_pin=None, home_angle=0, home_speed=-0.1, max_step_rate=2156):
         """
         Represents and controls turret stepper motor driven by an A4988 control board
 
@@ -573,13 +1443,165 @@ class Stepper:
             steps_per_rev (int): number of steps to turn the axis 360 deg (PAN = 4950, TILT = 1694)
             step_pin (board.pin): Pico GPIO pin connected to A4988 step (STEP) pin
             direction_pin (board.pin): Pico GPIO pin connected to A4988 direction (DIR) pin
-            hold_pin (board.pin): Pico GPIO pin connected to A4988 hold toggle (ENABLE) pin
+            step_res (float, optional): microstep resolution steps_per_rev was measured at. Defaults to 1/16.
+            max_speed (float, optional): axis speed at speed = 1 in deg/s. Defaults to the
+            A4988 step ceiling at step_res.
+            pio (bool, optional): generate steps with a PIO state machine (PioA4988) instead
+            of PWM (A4988). Defaults to False.
+            limits (tuple, optional): (min, max) soft limit angles in deg. Defaults to None, no limits.
+            decel (float, optional): deceleration planned when approaching a limit in deg/s^2.
+            Defaults to None, which runs at full speed up to the limit.
+            home_pin (board.pin, optional): Pico GPIO pin of a normally open limit switch to ground,
+            used by home(). Defaults to None.
+            home_angle (float, optional): axis angle where the limit switch closes in deg. Defaults to 0.
+            home_speed (float, optional): homing search speed, signed towards the switch, multiple
+            of max speed. Defaults to -0.1.
+            max_step_rate (int, optional): highest STEP pulse frequency of the driver. Defaults to 2156.
         """
         # control params
         self.steps_per_rev = steps_per_rev
+        self.step_res = step_res
+        self.speed = 0
+        self.limits = limits
+        self.decel = decel
+        self.offset = 0     # driver step count at angle 0
+
+        # homing switch, pulled up and closing to ground
+        self.home_angle = home_angle
+        self.home_speed = home_speed
+        self.home_switch = None
+        if home_pin is not None:
+            self.home_switch = DigitalInOut(home_pin)
+            self.home_switch.direction = Direction.INPUT
+            self.home_switch.pull = Pull.UP
 
         # stepper controller
-        self.driver = A4988(DIR=direction_pin, STEP=step_pin)
+        driver = PioA4988 if pio else A4988
+        self.driver = driver(DIR=direction_pin, STEP=step_pin, max_steps_per_second=max_step_rate,
+                             max_step_rate=max_step_rate)
+        if max_speed is not None:
+            self.driver.max_steps_per_second = max_speed / 360 * steps_per_rev
+
+    @property
+    def full_steps_per_second(self):
+        """
+        Full step rate needed for the current commanded speed
+        """
+        return abs(self.speed) * self.driver.max_steps_per_second * self.step_res
+
+    @property
+    def position(self):
+        """
+        Estimated position of the axis from its zero in steps at the current resolution
+        """
+        return self.driver.steps - self.offset
+
+    @property
+    def angle(self):
+        """
+        Estimated position of the axis in degrees
+        """
+        return 360 * self.position / self.steps_per_rev
+
+    def set_angle(self, angle):
+        """
+        Declare the current position of the axis to be at an angle
+
+        Args:
+            angle (float): current angle in degrees
+        """
+        self.offset = self.driver.steps - angle / 360 * self.steps_per_rev
+
+    async def home(self, timeout=30):
+        """
+        Drive the axis towards its limit switch until it closes, then zero the angle from home_angle.
+        The soft limits are ignored while searching since the angle isn't known yet.
+
+        Args:
+            timeout (float, optional): seconds to search before giving up. Defaults to 30.
+
+        Raises:
+            ValueError: the stepper has no home_pin
+            RuntimeError: the switch didn't close within timeout
+        """
+        if self.home_switch is None:
+            raise ValueError("no home switch on this axis")
+        self.speed = 0
+        start = time.monotonic()
+        if self.home_switch.value:
+            self.driver.set_speed_pwm(self.home_speed)
+        try:
+            while self.home_switch.value:
+                if time.monotonic() - start > timeout:
+                    raise RuntimeError("home switch not found")
+                await asyncio.sleep(0)
+        finally:
+            self.driver.set_speed_pwm(0)
+        self.set_angle(self.home_angle)
+
+    @property
+    def max_speed(self):
+        """
+        Axis speed at speed = 1 in deg/s
+        """
+        return 360 * self.driver.max_steps_per_second / self.steps_per_rev
+
+    def clamp_angle(self, angle):
+        """
+        Clamp an angle to the soft limits
+
+        Args:
+            angle (float): angle in degrees
+
+        Returns:
+            float: the nearest angle within the limits
+        """
+        if self.limits is None:
+            return angle
+        return min(max(angle, self.limits[0]), self.limits[1])
+
+    def limit_speed(self, speed):
+        """
+        Slow a speed so the axis can still decelerate to a stop at the soft limit it is heading for
+
+        Args:
+            speed (float): -1 to 1, multiple of max speed
+
+        Returns:
+            float: the speed allowed at the current angle
+        """
+        if self.limits is None or speed == 0:
+            return speed
+        if speed > 0:
+            room = self.limits[1] - self.angle
+        else:
+            room = self.angle - self.limits[0]
+        if room <= 0:
+            return 0
+        if self.decel is None:
+            return speed
+        allowed = math.sqrt(2 * self.decel * room) / self.max_speed
+        return max(-allowed, min(speed, allowed))
+
+    def enforce_limits(self):
+        """
+        Re-apply the commanded speed under the soft limits, call this periodically while moving
+        """
+        if self.speed and self.limits is not None:
+            self.driver.set_speed_pwm(self.limit_speed(self.speed))
+
+    def set_step_res(self, step_res):
+        """
+        Rescale steps_per_rev and the driver bookkeeping after the A4988 microstep pins changed
+
+        Args:
+            step_res (float): new fraction of a full step per STEP pulse
+        """
+        factor = self.step_res / step_res
+        self.steps_per_rev *= factor
+        self.offset *= factor
+        self.driver.rescale(factor)
+        self.step_res = step_res
     
     def set_speed(self, speed):
         """
@@ -588,9 +1610,149 @@ class Stepper:
         Args:
             speed (float): -1 to 1, multiple of max speed
         """
-        self.driver.set_speed_pwm(speed)
+        self.speed = speed
+        self.driver.set_speed_pwm(self.limit_speed(speed))
+
+    async def move(self, steps, speed=1, accel=None):
+        """
+        Move the motor a number of steps at the current resolution and stop, short of the soft limits
+
+        Args:
+            steps (int): signed number of steps to move
+            speed (float, optional): 0 to 1, multiple of max speed. Defaults to 1.
+            accel (float, optional): acceleration in steps per second squared, PIO driver only
+        """
+        self.speed = 0
+        if self.limits is not None:
+            position = self.position
+            target = 360 * (position + steps) / self.steps_per_rev
+            if self.clamp_angle(target) != target:
+                # whole steps up to the limit, never past it
+                steps = int(self.clamp_angle(target) / 360 * self.steps_per_rev - position)
+        await self.driver.move(steps, speed, accel)
+
+class ServoProfile:
+    """
+    Timing model of the MG996R trigger servo. The servo has no position feedback, so moves
+    are timed from its transit speed, which depends on the supply voltage and the load.
+    """
+    # no-load transit speed from the MG996R datasheet, (supply V, s per 60 deg)
+    DATASHEET_SPEEDS = ((4.8, 0.17), (6.0, 0.14))
+    # the trigger spring slows the servo down, datasheet speeds are stretched by this much
+    LOAD_MARGIN = 1.3
+    # 4.8 V datasheet speed with the load margin, used until the trigger is calibrated
+    DEFAULT_SEC_PER_60 = 0.22
+    # calibrated profile kept in nvm at NVM_SERVO_PROFILE
+    PROFILE_FORMAT = "<4sffH"
+    PROFILE_MAGIC = b"NSSV"
+
+    def __init__(self, sec_per_60=DEFAULT_SEC_PER_60, settle_time=0.03, segments=4):
+        """
+        Args:
+            sec_per_60 (float, optional): time to travel 60 deg in s. Defaults to DEFAULT_SEC_PER_60.
+            settle_time (float, optional): time to wait after the travel for the horn to settle in s.
+            Defaults to 0.03.
+            segments (int, optional): number of timed steps a move is split into. Defaults to 4.
+        """
+        self.sec_per_60 = sec_per_60
+        self.settle_time = settle_time
+        self.segments = segments
+
+    @classmethod
+    def for_voltage(cls, volts):
+        """
+        Profile with the datasheet transit speed interpolated at a supply voltage, stretched
+        by LOAD_MARGIN for the trigger spring
+
+        Args:
+            volts (float): servo supply voltage
+
+        Returns:
+            ServoProfile: the profile
+        """
+        (v0, t0), (v1, t1) = cls.DATASHEET_SPEEDS
+        volts = min(max(volts, v0), v1)
+        return cls(sec_per_60=(t0 + (t1 - t0) * (volts - v0) / (v1 - v0)) * cls.LOAD_MARGIN)
+
+    @classmethod
+    def load(cls):
+        """
+        Read the profile written by save, or the default profile if there is none
+
+        Returns:
+            ServoProfile: the profile
+        """
+        if microcontroller.nvm is None:
+            return cls()
+        size = struct.calcsize(cls.PROFILE_FORMAT)
+        magic, sec_per_60, settle_time, segments = struct.unpack(
+            cls.PROFILE_FORMAT, microcontroller.nvm[NVM_SERVO_PROFILE:NVM_SERVO_PROFILE + size])
+        if magic != cls.PROFILE_MAGIC:
+            return cls()
+        return cls(sec_per_60, settle_time, segments)
+
+    def save(self):
+        """
+        Store the profile in nvm for later boots
+
+        Raises:
+            OSError: the board has no nvm
+        """
+        if microcontroller.nvm is None:
+            raise OSError("no nvm to save the servo profile in")
+        record = struct.pack(self.PROFILE_FORMAT, self.PROFILE_MAGIC, self.sec_per_60,
+                             self.settle_time, self.segments)
+        microcontroller.nvm[NVM_SERVO_PROFILE:NVM_SERVO_PROFILE + len(record)] = record
+
+    def travel_time(self, start, end):
+        """
+        Time for the servo to travel between two angles, without settling
+
+        Args:
+            start (float): starting angle in degrees
+            end (float): target angle in degrees
+
+        Returns:
+            float: travel time in s
+        """
+        return abs(end - start) / 60 * self.sec_per_60
+
+    async def move(self, servo, angle):
+        """
+        Move a servo to an angle in timed segments at its transit speed and return once it
+        has arrived. A servo at an unknown angle is assumed to travel the full 180 deg.
+
+        Args:
+            servo (Servo): the servo to move
+            angle (float): target angle in degrees
+        """
+        start = servo.angle
+        if start is None or not 0 <= start <= 180:
+            # position unknown, e.g. a PWM duty cycle from before the servo was set up
+            start = 180 - angle if angle <= 90 else 0
+        segment_time = self.travel_time(start, angle) / self.segments
+        for i in range(1, self.segments + 1):
+            servo.angle = start + (angle - start) * i / self.segments
+            await asyncio.sleep(segment_time)
+        await asyncio.sleep(self.settle_time)
+
 
 class Trigger:
+    # servo angles of the trigger puller
+    PULL_ANGLE = 0
+    REST_ANGLE = 180
+    # flywheel spin up time from rest, and how long it is kept spinning after the last shot
+    SPIN_UP_TIME = 1.5
+    WARM_TIME = 2.0
+    # how long a target lock keeps the flywheel warm, the host repeats LOCK ON while tracking
+    LOCK_WARM_TIME = 5.0
+
+    # trigger states: flywheel off, flywheel on between darts, servo pulling, servo returning
+    IDLE = "idle"
+    SPINNING = "spinning"
+    PULLING = "pulling"
+    RETURNING = "returning"
+
     def __init__(self, servo_pin, flywheel_pin):
         """
         Represents trigger puller mechanism of the NERF gun, driven by an MG996R hobby servo.
@@ -600,44 +1762,179 @@ class Trigger:
         """
         # state parameters
         self.safety_on = False
+        self.state = self.IDLE
+        self.shots_queued = 0         # darts still to fire in the current burst
+        self._fire_task = None
+        self._fire_id = 0             # numbers fire tasks, so a cancelled one can tell it was replaced
+        self._spin_start = None       # time.monotonic() the flywheel was powered
+        self._warm_until = 0          # time.monotonic() the flywheel may spin down after
+        self.spin_held = False        # flywheel kept on by SPIN UP
         
-        # Servo control object
+        # Servo control object, moved at the transit speed calibrated for our supply
         pwm = pwmio.PWMOut(servo_pin, duty_cycle=2 ** 15, frequency=50)
         self.servo = servo.Servo(pwm)
+        self.servo.angle = self.REST_ANGLE
+        self.servo_profile = ServoProfile.load()
 
         # Flywheel motor relay control
         self.FLYWHEEL_ON = DigitalInOut(flywheel_pin)
         self.FLYWHEEL_ON.direction = Direction.OUTPUT
         self.FLYWHEEL_ON.value = False
     
+    def calibrate(self, supply_volts, sec_per_60=None):
+        """
+        Set the servo profile from a measured transit time, or estimate it for the servo supply
+        voltage, and save it to nvm so later boots time the trigger pull the same.
+        Sent by the host as CALIBRATE.
+
+        Args:
+            supply_volts (float): measured servo supply voltage
+            sec_per_60 (float, optional): time the servo takes for 60 deg of a pull in s, e.g.
+            timed from a slow motion video. Defaults to None, estimate it from supply_volts.
+
+        Raises:
+            OSError: the profile is in use but could not be saved
+        """
+        if sec_per_60 is None:
+            self.servo_profile = ServoProfile.for_voltage(supply_volts)
+        else:
+            self.servo_profile = ServoProfile(sec_per_60=sec_per_60)
+        self.servo_profile.save()
+
     def toggle_safety(self):
         """
         Toggle the boolean state of trigger safety
         """
-        self.safety_on = not self.safety_on
-    
-    async def fire(self):
-        """
-        Spin up flywheel if necessary and pull trigger servo to shoot one NERF dart
-        """
-        # if self.safety_on:
-        #     await asyncio.sleep(0)
-        #     return
-        # spin up flywheels if necessary
-        # if not self.FLYWHEEL_ON.value:
-        self.FLYWHEEL_ON.value = True
-        await asyncio.sleep(1.5)
-
-        # pull trigger servo (only if it is in a retracted state)
-        # if self.servo.angle < 10:
-        self.servo.angle = 0
-        await asyncio.sleep(1)
-        self.servo.angle = 180
-        await asyncio.sleep(.25)
-
-        # spin down flywheels
+        self.set_safety(not self.safety_on)
+
+    def set_safety(self, state):
+        """
+        Set the trigger safety. While it is on fire requests are ignored, and turning it on
+        aborts any shot in progress.
+
+        Args:
+            state (bool): True for safety on
+        """
+        self.safety_on = state
+        if state:
+            self.cancel()
+
+    def cancel(self):
+        """
+        Abort firing immediately: drop queued darts, cancel the fire task, return the servo
+        and stop the flywheel. Safe to call without a running event loop.
+        """
+        self.shots_queued = 0
+        self.spin_held = False
+        self._warm_until = 0
+        if self._fire_task is not None:
+            self._fire_id += 1
+            self._fire_task.cancel()
+            self._fire_task = None
+        self._teardown()
+
+    def _teardown(self):
+        # leave the mechanism safe: servo back at rest, flywheel relay off
+        self.servo.angle = self.REST_ANGLE
         self.FLYWHEEL_ON.value = False
-        await asyncio.sleep(0)
+        self.state = self.IDLE
+
+    def fire(self, shots=1):
+        """
+        Queue darts to fire and return immediately. Queued darts are fired back to back
+        and the flywheel stays spinning between them.
+
+        Args:
+            shots (int, optional): number of darts to fire. Defaults to 1.
+        """
+        if self.safety_on or shots < 1:
+            return
+        self.shots_queued += shots
+        self._start()
+
+    def spin(self, state):
+        """
+        Spin the flywheel up and keep it spinning, or let it spin down once no darts are queued
+
+        Args:
+            state (bool): True to spin up, False to spin down
+        """
+        self.spin_held = state
+        if state:
+            self._start()
+        else:
+            self._warm_until = 0
+
+    def warm(self, duration, extend=True):
+        """
+        Keep the flywheel spinning for a while so a coming shot skips the spin up
+
+        Args:
+            duration (float): seconds from now to keep it spinning
+            extend (bool, optional): only ever lengthen the current warm time and spin the flywheel
+            up. Defaults to True, False only shortens it and never starts the flywheel.
+        """
+        warm_until = time.monotonic() + duration
+        if not extend:
+            # a running fire task spins down by itself once the shorter time is up
+            self._warm_until = min(self._warm_until, warm_until)
+            return
+        self._warm_until = max(self._warm_until, warm_until)
+        self._start()
+
+    def _start(self):
+        # power the flywheel and start the fire task if it isn't running
+        if not self.FLYWHEEL_ON.value:
+            self.FLYWHEEL_ON.value = True
+            self._spin_start = time.monotonic()
+        if self._fire_task is None:
+            self.state = self.SPINNING
+            self._fire_id += 1
+            self._fire_task = asyncio.create_task(self._run_fire(self._fire_id))
+
+    async def spin_up(self):
+        """
+        Power the flywheel and wait until it is up to speed, no wait if it already is
+        """
+        if not self.FLYWHEEL_ON.value:
+            self.FLYWHEEL_ON.value = True
+            self._spin_start = time.monotonic()
+        remaining = self.SPIN_UP_TIME - (time.monotonic() - self._spin_start)
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+
+    async def _run_fire(self, fire_id):
+        """
+        Fire queued darts, then keep the flywheel spinning while it is held or warm.
+        This is the only place the trigger changes state, one dart at a time:
+        SPINNING -> PULLING -> RETURNING -> SPINNING, and IDLE once the flywheel stops.
+        Cancelling it always returns the servo and stops the flywheel.
+
+        Args:
+            fire_id (int): number of this fire task
+        """
+        try:
+            while self.shots_queued > 0 or self.spin_held or time.monotonic() < self._warm_until:
+                if self.shots_queued <= 0:
+                    await asyncio.sleep(0.01)
+                    continue
+                await self.spin_up()
+                if self.shots_queued <= 0:
+                    continue
+                self.shots_queued -= 1
+
+                # pull trigger servo, then return it for the next dart
+                self.state = self.PULLING
+                await self.servo_profile.move(self.servo, self.PULL_ANGLE)
+                self.state = self.RETURNING
+                await self.servo_profile.move(self.servo, self.REST_ANGLE)
+                self.state = self.SPINNING
+                self._warm_until = max(self._warm_until, time.monotonic() + self.WARM_TIME)
+        finally:
+            # spin down flywheels, unless cancel() already did and a new fire task took over
+            if fire_id == self._fire_id:
+                self._fire_task = None
+                self._teardown()
 
 class StepperHold:
     def __init__(self, hold_pin):
@@ -658,3 +1955,9 @@ class StepperHold:
         """
         self.DISABLE_HOLD.value = not self.DISABLE_HOLD.value
 
+    def release(self):
+        """
+        Turn hold off so the steppers are unpowered and spin freely
+        """
+        self.DISABLE_HOLD.value = True
+
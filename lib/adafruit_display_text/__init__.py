@@ -12,6 +12,11 @@ __repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_Display_Text.git"
 
 from displayio import Group, Palette
 
+try:
+    from collections import OrderedDict
+except ImportError:
+    from ucollections import OrderedDict
+
 try:
     from typing import Optional, List, Tuple
     from fontio import FontProtocol
@@ -19,6 +24,44 @@ except ImportError:
     pass
 
 
+# Per font caches for wrap_text_to_pixels: a width table for every character
+# measured so far, and a small LRU of whole word widths
+_char_widths = {}
+_word_widths = {}
+_WORD_CACHE_SIZE = 64
+
+
+def _font_measurers(font: FontProtocol):
+    """Return ``(measure, measure_word)`` functions that add up cached glyph widths
+    for ``font``"""
+    char_widths = _char_widths.get(font)
+    if char_widths is None:
+        char_widths = _char_widths[font] = {}
+        _word_widths[font] = OrderedDict()
+    word_widths = _word_widths[font]
+
+    def measure(text):
+        total = 0
+        for char in text:
+            width = char_widths.get(char)
+            if width is None:
+                width = char_widths[char] = font.get_glyph(ord(char)).shift_x
+            total += width
+        return total
+
+    def measure_word(word):
+        width = word_widths.pop(word, None)
+        if width is None:
+            width = measure(word)
+            if len(word_widths) >= _WORD_CACHE_SIZE:
+                # drop the least recently used word
+                del word_widths[next(iter(word_widths))]
+        word_widths[word] = width
+        return width
+
+    return measure, measure_word
+
+
 def wrap_text_to_pixels(
     string: str,
     max_width: int,
@@ -51,24 +94,30 @@ def wrap_text_to_pixels(
         def measure(text):
             return len(text)
 
+        measure_word = measure
+
     else:
         if hasattr(font, "load_glyphs"):
             font.load_glyphs(string)
 
-        def measure(text):
-            return sum(font.get_glyph(ord(c)).shift_x for c in text)
+        measure, measure_word = _font_measurers(font)
 
     lines = []
     partial = [indent0]
-    width = measure(indent0)
+    # width is the running estimate used to place whole words, partial_width is
+    # the exact width of everything in partial
+    width = partial_width = measure(indent0)
+    indent1_width = measure(indent1)
     swidth = measure(" ")
+    hyphen_width = measure("-")
     firstword = True
     for line_in_input in string.split("\n"):
         newline = True
         for index, word in enumerate(line_in_input.split(" ")):
-            wwidth = measure(word)
+            wwidth = measure_word(word)
             word_parts = []
             cur_part = ""
+            cur_width = 0
 
             if wwidth > max_width:
                 for char in word:
@@ -78,12 +127,9 @@ def wrap_text_to_pixels(
                     else:
                         extraspace = swidth
                         leadchar = " "
+                    cwidth = measure(char)
                     if (
-                        measure("".join(partial))
-                        + measure(cur_part)
-                        + measure(char)
-                        + measure("-")
-                        + extraspace
+                        partial_width + cur_width + cwidth + hyphen_width + extraspace
                         > max_width
                     ):
                         if cur_part:
@@ -94,38 +140,45 @@ def wrap_text_to_pixels(
                         else:
                             word_parts.append("".join(partial))
                         cur_part = char
+                        cur_width = cwidth
                         partial = [indent1]
+                        partial_width = indent1_width
                         newline = True
                     else:
                         cur_part += char
+                        cur_width += cwidth
                 if cur_part:
                     word_parts.append(cur_part)
                 for line in word_parts[:-1]:
                     lines.append(line)
                 partial.append(word_parts[-1])
-                width = measure(word_parts[-1])
+                partial_width += cur_width
+                width = cur_width
                 if firstword:
                     firstword = False
             else:
                 if firstword:
                     partial.append(word)
+                    partial_width += wwidth
                     firstword = False
                     width += wwidth
                 elif width + swidth + wwidth < max_width:
                     if index > 0:
                         partial.append(" ")
+                        partial_width += swidth
                     partial.append(word)
+                    partial_width += wwidth
                     width += wwidth + swidth
                 else:
                     lines.append("".join(partial))
                     partial = [indent1, word]
-                    width = measure(indent1) + wwidth
+                    width = partial_width = indent1_width + wwidth
             if newline:
                 newline = False
 
         lines.append("".join(partial))
         partial = [indent1]
-        width = measure(indent1)
+        width = partial_width = indent1_width
 
     return lines
 
@@ -29,6 +29,12 @@ __repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_Display_Text.git"
 import displayio
 from adafruit_display_text import LabelBase
 
+try:
+    # CircuitPython 9 moved blit out of displayio.Bitmap and into bitmaptools
+    import bitmaptools
+except ImportError:
+    bitmaptools = None
+
 try:
     from typing import Optional, Tuple
     from fontio import FontProtocol
@@ -80,7 +86,13 @@ class Label(LabelBase):
      tab character
     :param str label_direction: string defining the label text orientation. There are 5
      configurations possibles ``LTR``-Left-To-Right ``RTL``-Right-To-Left
-     ``UPD``-Upside Down ``UPR``-Upwards ``DWR``-Downwards. It defaults to ``LTR``"""
+     ``UPD``-Upside Down ``UPR``-Upwards ``DWR``-Downwards. It defaults to ``LTR``
+    :param int max_characters: Set to switch to fixed width mode for text that changes
+     often, like numeric readouts. The bitmap is sized once for this many characters laid
+     out in cells of the font bounding box width, each character is rendered once and
+     cached, and setting ``text`` only redraws the cells whose character changed. Text
+     must be a single line no longer than ``max_characters``; best used with monospaced
+     fonts. Defaults to `None` (normal layout)"""
 
     # This maps label_direction to TileGrid's transpose_xy, flip_x, flip_y
     _DIR_MAP = {
@@ -91,11 +103,20 @@ class Label(LabelBase):
         "RTL": (False, False, False),
     }
 
-    def __init__(self, font: FontProtocol, save_text: bool = True, **kwargs) -> None:
+    def __init__(
+        self,
+        font: FontProtocol,
+        save_text: bool = True,
+        max_characters: Optional[int] = None,
+        **kwargs
+    ) -> None:
 
         self._bitmap = None
         self._tilegrid = None
         self._prev_label_direction = None
+        self._max_characters = max_characters
+        self._cell_cache = None  # pre-rendered character cells in fixed width mode
+        self._cells = None  # characters currently drawn in each cell
 
         super().__init__(font, **kwargs)
 
@@ -122,6 +143,7 @@ class Label(LabelBase):
         # Store all the instance variables
         if font is not None:
             self._font = font
+            self._cell_cache = None  # cached cells were rendered in the old font
         if line_spacing is not None:
             self._line_spacing = line_spacing
 
@@ -134,8 +156,11 @@ class Label(LabelBase):
         else:
             self._text = None  # save a None value since text string is not saved
 
+        if self._max_characters is not None:
+            self._place_fixed_text(text or "")
+
         # Check for empty string
-        if (text == "") or (
+        elif (text == "") or (
             text is None
         ):  # If empty string, just create a zero-sized bounding box and that's it.
 
@@ -265,6 +290,92 @@ class Label(LabelBase):
         # x,y positions of the label
         self.anchored_position = self._anchored_position
 
+    def _place_fixed_text(self, text: str) -> None:
+        # Fixed width mode: the bitmap and tilegrid are created once, after that only
+        # the cells whose character changed are copied in from the cell cache
+        if len(text) > self._max_characters or "\n" in text:
+            raise ValueError(
+                "Text must be a single line of at most {} characters".format(
+                    self._max_characters
+                )
+            )
+        text += " " * (self._max_characters - len(text))
+        if self._label_direction == "RTL":
+            text = "".join(reversed(text))
+
+        cell_width = self._font.get_bounding_box()[0]
+        cell_height = self._ascent + self._descent
+
+        new_tilegrid = self._cell_cache is None
+        if new_tilegrid:
+            self._cell_cache = {}
+            self._cells = [None] * self._max_characters
+
+            box_x = (
+                self._max_characters * cell_width
+                + self._padding_left
+                + self._padding_right
+            )
+            box_y = cell_height + self._padding_top + self._padding_bottom
+            self._bitmap = displayio.Bitmap(box_x, box_y, len(self._palette))
+
+            if self._base_alignment:
+                label_position_yoffset = 0
+            else:
+                label_position_yoffset = self._ascent // 2
+
+            self._tilegrid = displayio.TileGrid(
+                self._bitmap,
+                pixel_shader=self._palette,
+                width=1,
+                height=1,
+                tile_width=box_x,
+                tile_height=box_y,
+                default_tile=0,
+                x=-self._padding_left,
+                y=label_position_yoffset - self._ascent - self._padding_top,
+            )
+            for _ in self._local_group:
+                self._local_group.pop(0)
+            self._local_group.append(self._tilegrid)
+
+            if self._label_direction in ("UPR", "DWR"):
+                self._bounding_box = (
+                    self._tilegrid.x,
+                    self._tilegrid.y,
+                    cell_height,
+                    box_x,
+                )
+            else:
+                self._bounding_box = (
+                    self._tilegrid.x,
+                    self._tilegrid.y,
+                    box_x,
+                    cell_height,
+                )
+
+        if new_tilegrid or self._label_direction != self._prev_label_direction:
+            tg1 = self._tilegrid
+            tg1.transpose_xy, tg1.flip_x, tg1.flip_y = self._DIR_MAP[
+                self._label_direction
+            ]
+
+        for index, char in enumerate(text):
+            if self._cells[index] == char:
+                continue
+            cell = self._cell_cache.get(char)
+            if cell is None:
+                cell = displayio.Bitmap(cell_width, cell_height, len(self._palette))
+                self._place_text(cell, char, self._font, 0, self._ascent)
+                self._cell_cache[char] = cell
+            self._blit(
+                self._bitmap,
+                self._padding_left + index * cell_width,
+                self._padding_top,
+                cell,
+            )
+            self._cells[index] = char
+
     @staticmethod
     def _line_spacing_ypixels(font: FontProtocol, line_spacing: float) -> int:
         # Note: Scaling is provided at the Group level
@@ -477,10 +588,7 @@ class Label(LabelBase):
                 skip_index=skip_index,
             )
 
-        else:  # perform pixel by pixel copy of the bitmap
-
-            # Perform input checks
-
+        else:
             if x_2 is None:
                 x_2 = source_bitmap.width
             if y_2 is None:
@@ -492,35 +600,48 @@ class Label(LabelBase):
             if y_1 > y_2:
                 y_1, y_2 = y_2, y_1
 
-            # Ensure that x2 and y2 are within source bitmap size
-            x_2 = min(x_2, source_bitmap.width)
-            y_2 = min(y_2, source_bitmap.height)
-
-            for y_count in range(y_2 - y_1):
-                for x_count in range(x_2 - x_1):
-                    x_placement = x + x_count
-                    y_placement = y + y_count
-
-                    if (bitmap.width > x_placement >= 0) and (
-                        bitmap.height > y_placement >= 0
-                    ):  # ensure placement is within target bitmap
-
-                        # get the palette index from the source bitmap
-                        this_pixel_color = source_bitmap[
-                            y_1
-                            + (
-                                y_count * source_bitmap.width
-                            )  # Direct index into a bitmap array is speedier than [x,y] tuple
-                            + x_1
-                            + x_count
-                        ]
-
-                        if (skip_index is None) or (this_pixel_color != skip_index):
-                            bitmap[  # Direct index into a bitmap array is speedier than [x,y] tuple
-                                y_placement * bitmap.width + x_placement
-                            ] = this_pixel_color
-                    elif y_placement > bitmap.height:
-                        break
+            if bitmaptools is not None and hasattr(bitmaptools, "blit"):
+                bitmaptools.blit(
+                    bitmap,
+                    source_bitmap,
+                    x,
+                    y,
+                    x1=x_1,
+                    y1=y_1,
+                    x2=x_2,
+                    y2=y_2,
+                    skip_source_index=skip_index,
+                )
+                return
+
+            # Perform row by row copy of the bitmap, clipping the source rectangle
+            # against both bitmaps once up front so the inner loops need no checks
+            if x < 0:
+                x_1 -= x
+                x = 0
+            if y < 0:
+                y_1 -= y
+                y = 0
+            x_2 = min(x_2, source_bitmap.width, x_1 + bitmap.width - x)
+            y_2 = min(y_2, source_bitmap.height, y_1 + bitmap.height - y)
+            if x_1 >= x_2 or y_1 >= y_2:
+                return
+
+            span = x_2 - x_1
+            source_width = source_bitmap.width
+            target_width = bitmap.width
+            # Direct index into a bitmap array is speedier than [x,y] tuple
+            for row in range(y_2 - y_1):
+                source_index = (y_1 + row) * source_width + x_1
+                target_index = (y + row) * target_width + x
+                if skip_index is None:
+                    for i in range(span):
+                        bitmap[target_index + i] = source_bitmap[source_index + i]
+                else:
+                    for i in range(span):
+                        this_pixel_color = source_bitmap[source_index + i]
+                        if this_pixel_color != skip_index:
+                            bitmap[target_index + i] = this_pixel_color
 
     def _set_line_spacing(self, new_line_spacing: float) -> None:
         if self._save_text:
@@ -553,6 +674,8 @@ class Label(LabelBase):
         if self._label_direction != new_label_direction:
             self._prev_label_direction = self._label_direction
             self._label_direction = new_label_direction
+            # fixed width mode sizes its bounding box for the direction, lay it out again
+            self._cell_cache = None
             self._reset_text(text=str(self._text))  # Force a recalculation
 
     def _get_valid_label_directions(self) -> Tuple[str, ...]:
@@ -48,7 +48,11 @@ class ScrollingLabel(bitmap_label.Label):
     :param float animate_time: The number of seconds in between scrolling animation
      frames. Default is 0.3 seconds.
     :param int current_index: The index of the first visible character in the label.
-     Default is 0, the first character. Will increase while scrolling."""
+     Default is 0, the first character. Will increase while scrolling.
+    :param bool fixed_width: Run in the fixed width mode of :py:class:`~bitmap_label.Label`,
+     so each animation frame only copies pre-rendered character cells into the existing
+     bitmap instead of laying the text out again. Cells are as wide as the font bounding
+     box, so only use it with monospaced fonts and single line text. Default is False."""
 
     # pylint: disable=too-many-arguments
     def __init__(
@@ -58,18 +62,23 @@ class ScrollingLabel(bitmap_label.Label):
         text: Optional[str] = "",
         animate_time: Optional[float] = 0.3,
         current_index: Optional[int] = 0,
+        fixed_width: bool = False,
         **kwargs
     ) -> None:
 
-        super().__init__(font, **kwargs)
+        super().__init__(
+            font, max_characters=max_characters if fixed_width else None, **kwargs
+        )
+        self._scroll_characters = max_characters
         self.animate_time = animate_time
         self._current_index = current_index
         self._last_animate_time = -1
-        self.max_characters = max_characters
 
         if text[-1] != " ":
             text = "{} ".format(text)
         self._full_text = text
+        # every window of max_characters is a plain slice of the text repeated twice
+        self._scroll_text = text + text
 
         self.update()
 
@@ -90,22 +99,9 @@ class ScrollingLabel(bitmap_label.Label):
                 self._last_animate_time = _now
                 return
 
-            if self.current_index + self.max_characters <= len(self.full_text):
-                _showing_string = self.full_text[
-                    self.current_index : self.current_index + self.max_characters
-                ]
-            else:
-                _showing_string_start = self.full_text[self.current_index :]
-                _showing_string_end = "{}".format(
-                    self.full_text[
-                        : (self.current_index + self.max_characters)
-                        % len(self.full_text)
-                    ]
-                )
-
-                _showing_string = "{}{}".format(
-                    _showing_string_start, _showing_string_end
-                )
+            _showing_string = self._scroll_text[
+                self.current_index : self.current_index + self.max_characters
+            ]
             self.text = _showing_string
 
             self.current_index += 1
@@ -113,6 +109,22 @@ class ScrollingLabel(bitmap_label.Label):
 
             return
 
+    @property
+    def max_characters(self) -> int:
+        """The number of characters that sets the fixed-width.
+
+        :return int: The maximum number of characters shown at once
+        """
+        return self._scroll_characters
+
+    @max_characters.setter
+    def max_characters(self, new_max_characters: int) -> None:
+        self._scroll_characters = new_max_characters
+        if self._max_characters is not None:
+            self._max_characters = new_max_characters
+            self._cell_cache = None  # the bitmap has to be resized
+        self.update(True)
+
     @property
     def current_index(self) -> int:
         """Index of the first visible character.
@@ -142,5 +154,6 @@ class ScrollingLabel(bitmap_label.Label):
         if new_text[-1] != " ":
             new_text = "{} ".format(new_text)
         self._full_text = new_text
+        self._scroll_text = new_text + new_text
         self.current_index = 0
         self.update()
@@ -80,6 +80,131 @@ class MHMSBFormat:
                     (color != 0) << offset
                 )
 
+    @staticmethod
+    def scroll(framebuf, delta_x, delta_y):
+        """Shift the buffer contents by whole rows and bytes, bit shifting only what is
+        left over. Areas scrolled away from keep their previous contents."""
+        # pylint: disable=too-many-locals, too-many-branches
+        if framebuf.stride & 0x07:
+            # rows don't start on a byte boundary, move pixel by pixel
+            MHMSBFormat.scroll_pixels(framebuf, delta_x, delta_y)
+            return
+        buf = framebuf.buf
+        width = framebuf.width
+        row_stride = framebuf.stride // 8
+        row_len = (width + 7) // 8
+        height = framebuf.height
+        # only these rows get moved content, the rest are left as they are
+        top = max(delta_y, 0) * row_stride
+        bottom = (height + min(delta_y, 0)) * row_stride
+        if delta_x:
+            # the column strip scrolled away from, saved before the rows move
+            if delta_x > 0:
+                strip = (0, delta_x)
+            else:
+                strip = (width + delta_x, width)
+            first = strip[0] >> 3
+            last = ((strip[1] - 1) >> 3) + 1
+            masks = [
+                (0xFF >> max(strip[0] - 8 * i, 0)) & ~(0xFF >> min(strip[1] - 8 * i, 8))
+                for i in range(first, last)
+            ]
+            kept = [
+                bytes(buf[row + first : row + last])
+                for row in range(top, bottom, row_stride)
+            ]
+        # rows are contiguous, so a vertical shift is a single slice move
+        if delta_y > 0:
+            buf[delta_y * row_stride : height * row_stride] = buf[
+                0 : (height - delta_y) * row_stride
+            ]
+        elif delta_y < 0:
+            buf[0 : (height + delta_y) * row_stride] = buf[
+                -delta_y * row_stride : height * row_stride
+            ]
+        if not delta_x:
+            return
+        byte_shift = abs(delta_x) >> 3
+        bit_shift = abs(delta_x) & 0x07
+        for row, old in zip(range(top, bottom, row_stride), kept):
+            end = row + row_len
+            if delta_x > 0:
+                edge = row + byte_shift
+                buf[edge:end] = buf[row : end - byte_shift]
+                if bit_shift:
+                    for i in range(end - 1, edge, -1):
+                        buf[i] = (buf[i] >> bit_shift) | (
+                            (buf[i - 1] << (8 - bit_shift)) & 0xFF
+                        )
+                    buf[edge] >>= bit_shift
+            else:
+                edge = end - byte_shift - 1
+                buf[row : end - byte_shift] = buf[row + byte_shift : end]
+                if bit_shift:
+                    for i in range(row, edge):
+                        buf[i] = ((buf[i] << bit_shift) & 0xFF) | (
+                            buf[i + 1] >> (8 - bit_shift)
+                        )
+                    buf[edge] = (buf[edge] << bit_shift) & 0xFF
+            # put the strip back, this also drops whatever was shifted in from the padding
+            for i, mask in enumerate(masks):
+                buf[row + first + i] = (buf[row + first + i] & ~mask) | (old[i] & mask)
+
+    @staticmethod
+    def scroll_pixels(framebuf, delta_x, delta_y):
+        """Shift the buffer contents one pixel at a time, for any stride"""
+        if delta_x < 0:
+            shift_x = 0
+            xend = framebuf.width + delta_x
+            dt_x = 1
+        else:
+            shift_x = framebuf.width - 1
+            xend = delta_x - 1
+            dt_x = -1
+        if delta_y < 0:
+            y = 0
+            yend = framebuf.height + delta_y
+            dt_y = 1
+        else:
+            y = framebuf.height - 1
+            yend = delta_y - 1
+            dt_y = -1
+        while y != yend:
+            x = shift_x
+            while x != xend:
+                MHMSBFormat.set_pixel(
+                    framebuf,
+                    x,
+                    y,
+                    MHMSBFormat.get_pixel(framebuf, x - delta_x, y - delta_y),
+                )
+                x += dt_x
+            y += dt_y
+
+    @staticmethod
+    def image(framebuf, data):
+        """Load packed 1 bit image rows, as returned by ``Image.tobytes()`` for mode "1".
+        Rows are already laid out MSB first so they are copied straight in."""
+        buf = framebuf.buf
+        row_len = (framebuf.width + 7) // 8
+        if framebuf.stride & 0x07:
+            # rows don't start on a byte boundary, set pixel by pixel
+            buf[:] = bytes(len(buf))
+            for y in range(framebuf.height):
+                row = y * row_len
+                for x in range(framebuf.width):
+                    if data[row + (x >> 3)] & (0x80 >> (x & 0x07)):
+                        MHMSBFormat.set_pixel(framebuf, x, y, 1)
+            return
+        row_stride = framebuf.stride // 8
+        if row_len == row_stride:
+            buf[0 : len(data)] = data
+            return
+        for y in range(framebuf.height):
+            buf[y * row_stride : y * row_stride + row_len] = data[
+                y * row_len : (y + 1) * row_len
+            ]
+
 
 class MVLSBFormat:
     """MVLSBFormat"""
@@ -104,26 +229,155 @@ class MVLSBFormat:
     def fill(framebuf, color):
         """completely fill/clear the buffer with a color"""
         if color:
-            fill = 0xFF
+            fill = b"\xff"
         else:
-            fill = 0x00
-        for i in range(len(framebuf.buf)):  # pylint: disable=consider-using-enumerate
-            framebuf.buf[i] = fill
+            fill = b"\x00"
+        framebuf.buf[:] = fill * len(framebuf.buf)
 
     @staticmethod
     def fill_rect(framebuf, x, y, width, height, color):
         """Draw a rectangle at the given location, size and color. The ``fill_rect`` method draws
         both the outline and interior."""
         # pylint: disable=too-many-arguments
-        while height > 0:
-            index = (y >> 3) * framebuf.stride + x
-            offset = y & 0x07
-            for w_w in range(width):
-                framebuf.buf[index + w_w] = (
-                    framebuf.buf[index + w_w] & ~(0x01 << offset)
-                ) | ((color != 0) << offset)
-            y += 1
-            height -= 1
+        buf = framebuf.buf
+        y_end = y + height
+        # work one 8 pixel tall page at a time, each column of a page is one byte
+        while y < y_end:
+            page = y >> 3
+            page_end = min(y_end, (page + 1) << 3)
+            mask = (0xFF << (y & 0x07)) & (0xFF >> (((page + 1) << 3) - page_end))
+            index = page * framebuf.stride + x
+            if mask == 0xFF:
+                # whole page is covered, write full bytes in one slice
+                buf[index : index + width] = (b"\xff" if color else b"\x00") * width
+            elif color:
+                for i in range(index, index + width):
+                    buf[i] |= mask
+            else:
+                mask = ~mask & 0xFF
+                for i in range(index, index + width):
+                    buf[i] &= mask
+            y = page_end
+
+    @staticmethod
+    def scroll(framebuf, delta_x, delta_y):
+        """Shift the buffer contents by whole pages and bytes, bit shifting only what is
+        left over. Areas scrolled away from keep their previous contents."""
+        # pylint: disable=too-many-locals, too-many-branches
+        buf = framebuf.buf
+        stride = framebuf.stride
+        width = framebuf.width
+        height = framebuf.height
+        pages = (height + 7) >> 3
+        # only these columns get moved content, the rest are left as they are
+        left = max(delta_x, 0)
+        right = width + min(delta_x, 0)
+        if delta_y:
+            # the row strip scrolled away from, saved before the columns move
+            if delta_y > 0:
+                strip = (0, delta_y)
+            else:
+                strip = (height + delta_y, height)
+            first = strip[0] >> 3
+            last = ((strip[1] - 1) >> 3) + 1
+            masks = [
+                ((1 << min(strip[1] - 8 * page, 8)) - 1)
+                & ~((1 << max(strip[0] - 8 * page, 0)) - 1)
+                for page in range(first, last)
+            ]
+            kept = [
+                bytes(buf[page * stride + left : page * stride + right])
+                for page in range(first, last)
+            ]
+        # every page is a contiguous run of column bytes, so x is a slice move
+        if delta_x:
+            span = width - abs(delta_x)
+            for row in range(0, pages * stride, stride):
+                if delta_x > 0:
+                    buf[row + delta_x : row + width] = buf[row : row + span]
+                else:
+                    buf[row : row + span] = buf[row - delta_x : row + width]
+        if not delta_y:
+            return
+        page_shift = abs(delta_y) >> 3
+        bit_shift = abs(delta_y) & 0x07
+        if delta_y > 0:
+            # walk pages bottom up so sources are read before they are overwritten
+            for page in range(pages - 1, page_shift - 1, -1):
+                dst = page * stride
+                src = (page - page_shift) * stride
+                if not bit_shift:
+                    buf[dst + left : dst + right] = buf[src + left : src + right]
+                elif page > page_shift:
+                    for i in range(left, right):
+                        buf[dst + i] = ((buf[src + i] << bit_shift) & 0xFF) | (
+                            buf[src + i - stride] >> (8 - bit_shift)
+                        )
+                else:
+                    for i in range(left, right):
+                        buf[dst + i] = (buf[src + i] << bit_shift) & 0xFF
+        else:
+            for page in range(pages - page_shift):
+                dst = page * stride
+                src = (page + page_shift) * stride
+                if not bit_shift:
+                    buf[dst + left : dst + right] = buf[src + left : src + right]
+                elif page + page_shift < pages - 1:
+                    for i in range(left, right):
+                        buf[dst + i] = (buf[src + i] >> bit_shift) | (
+                            (buf[src + i + stride] << (8 - bit_shift)) & 0xFF
+                        )
+                else:
+                    for i in range(left, right):
+                        buf[dst + i] = buf[src + i] >> bit_shift
+        # put the strip back, this also drops whatever was shifted in from the padding
+        for page, mask, old in zip(range(first, last), masks, kept):
+            row = page * stride
+            for i in range(left, right):
+                buf[row + i] = (buf[row + i] & ~mask) | (old[i - left] & mask)
+
+    @staticmethod
+    def image(framebuf, data):
+        """Load packed 1 bit image rows, as returned by ``Image.tobytes()`` for mode "1",
+        turning every 8 rows into a page of column bytes."""
+        # pylint: disable=too-many-locals
+        buf = framebuf.buf
+        width = framebuf.width
+        height = framebuf.height
+        stride = framebuf.stride
+        row_len = (width + 7) // 8
+        pages = (height + 7) >> 3
+        try:
+            # only available on CPython hosts, the loop below does the same on the board
+            import numpy  # pylint: disable=import-outside-toplevel
+        except ImportError:
+            numpy = None
+        if numpy is not None:
+            bits = numpy.zeros((pages * 8, width), dtype=numpy.uint8)
+            bits[:height] = numpy.unpackbits(
+                numpy.frombuffer(data, dtype=numpy.uint8)
+            ).reshape(height, row_len * 8)[:, :width]
+            packed = numpy.packbits(
+                bits.reshape(pages, 8, width).transpose(0, 2, 1),
+                axis=-1,
+                bitorder="little",
+            ).reshape(pages, width)
+            for page in range(pages):
+                buf[page * stride : page * stride + width] = packed[page].tobytes()
+            return
+        buf[:] = bytes(len(buf))
+        for y in range(height):
+            index = (y >> 3) * stride
+            bit = 1 << (y & 0x07)
+            row = y * row_len
+            for byte_x in range(row_len):
+                byte = data[row + byte_x]
+                if not byte:
+                    continue  # nothing lit in these 8 columns
+                x = index + (byte_x << 3)
+                for k in range(8):
+                    if byte & (0x80 >> k):
+                        buf[x + k] |= bit
 
 
 class RGB888Format:
@@ -168,6 +422,52 @@ class RGB888Format:
                 index = (_y * framebuf.stride + _x) * 3
                 framebuf.buf[index : index + 3] = bytes(fill)
 
+    @staticmethod
+    def scroll(framebuf, delta_x, delta_y):
+        """Shift the buffer contents with row slice moves. Areas scrolled away from keep
+        their previous contents."""
+        buf = framebuf.buf
+        row_stride = framebuf.stride * 3
+        height = framebuf.height
+        if not delta_x:
+            # whole rows move, so a vertical shift is a single slice move
+            if delta_y > 0:
+                buf[delta_y * row_stride : height * row_stride] = buf[
+                    0 : (height - delta_y) * row_stride
+                ]
+            elif delta_y < 0:
+                buf[0 : (height + delta_y) * row_stride] = buf[
+                    -delta_y * row_stride : height * row_stride
+                ]
+            return
+        # move only the part of each row that stays in view
+        span = (framebuf.width - abs(delta_x)) * 3
+        dst_x = max(delta_x, 0) * 3
+        src_x = max(-delta_x, 0) * 3
+        if delta_y > 0:
+            # walk rows bottom up so sources are read before they are overwritten
+            rows = range(height - 1, delta_y - 1, -1)
+        else:
+            rows = range(height + delta_y)
+        for y in rows:
+            dst = y * row_stride + dst_x
+            src = (y - delta_y) * row_stride + src_x
+            buf[dst : dst + span] = buf[src : src + span]
+
+    @staticmethod
+    def image(framebuf, data):
+        """Load RGB image rows, as returned by ``Image.tobytes()`` for mode "RGB"."""
+        buf = framebuf.buf
+        row_len = framebuf.width * 3
+        row_stride = framebuf.stride * 3
+        if row_len == row_stride:
+            buf[0 : len(data)] = data
+            return
+        for y in range(framebuf.height):
+            buf[y * row_stride : y * row_stride + row_len] = data[
+                y * row_len : (y + 1) * row_len
+            ]
+
 
 class FrameBuffer:
     """FrameBuffer object.
@@ -348,36 +648,114 @@ class FrameBuffer:
                 y += s_y
         self.pixel(x, y, color)
 
-    def blit(self):
-        """blit is not yet implemented"""
-        raise NotImplementedError()
+    def blit(self, src, x, y, key=-1):
+        """Draw another FrameBuffer on top of this one with its top left corner at the
+        given location, clipped to the edges of this one. Pixels of ``src`` whose color
+        equals ``key`` are left transparent; the default of -1 draws every pixel. When
+        both buffers share a format and the copy lands on a byte boundary whole bytes
+        are moved at once."""
+        # pylint: disable=too-many-arguments, too-many-locals, too-many-branches
+        if self.rotation:
+            # let pixel() map every point through the rotation
+            for s_y in range(src.height):
+                for s_x in range(src.width):
+                    color = src.format.get_pixel(src, s_x, s_y)
+                    if color != key:
+                        self.pixel(x + s_x, y + s_y, color)
+            return
+        x_0 = max(0, -x)
+        y_0 = max(0, -y)
+        x_1 = min(src.width, self.width - x)
+        y_1 = min(src.height, self.height - y)
+        if x_0 >= x_1 or y_0 >= y_1:
+            return
+        width = x_1 - x_0
+        if isinstance(src.format, (MVLSBFormat, MHMSBFormat)) and key not in (0, 1):
+            key = -1
+
+        if isinstance(self.format, MVLSBFormat) and isinstance(
+            src.format, MVLSBFormat
+        ) and not y & 0x07:
+            # pages line up, copy each page row as a run of column bytes
+            for s_y in range(y_0, y_1, 8):
+                rows = min(8, y_1 - s_y)
+                self._blit_bytes(
+                    ((y + s_y) >> 3) * self.stride + x + x_0,
+                    src.buf,
+                    (s_y >> 3) * src.stride + x_0,
+                    width,
+                    0xFF >> (8 - rows),
+                    key,
+                )
+            return
+        if (
+            isinstance(self.format, MHMSBFormat)
+            and isinstance(src.format, MHMSBFormat)
+            and not x & 0x07
+            and not src.stride & 0x07
+            and not self.stride & 0x07
+        ):
+            # bytes within a row line up, copy whole bytes and mask the last one
+            full, rest = divmod(width, 8)
+            for s_y in range(y_0, y_1):
+                dst = ((y + s_y) * self.stride + x + x_0) // 8
+                src_index = (s_y * src.stride + x_0) // 8
+                if full:
+                    self._blit_bytes(dst, src.buf, src_index, full, 0xFF, key)
+                if rest:
+                    self._blit_bytes(
+                        dst + full,
+                        src.buf,
+                        src_index + full,
+                        1,
+                        (0xFF << (8 - rest)) & 0xFF,
+                        key,
+                    )
+            return
+        if isinstance(self.format, RGB888Format) and isinstance(
+            src.format, RGB888Format
+        ) and key == -1:
+            for s_y in range(y_0, y_1):
+                dst = ((y + s_y) * self.stride + x + x_0) * 3
+                src_index = (s_y * src.stride + x_0) * 3
+                self.buf[dst : dst + width * 3] = src.buf[
+                    src_index : src_index + width * 3
+                ]
+            return
+
+        for s_y in range(y_0, y_1):
+            for s_x in range(x_0, x_1):
+                color = src.format.get_pixel(src, s_x, s_y)
+                if color != key:
+                    self.format.set_pixel(self, x + s_x, y + s_y, color)
+
+    def _blit_bytes(self, index, src_buf, src_index, count, mask, key):
+        """Merge ``count`` bytes of a 1 bit buffer into this one, touching only the bits
+        set in ``mask``"""
+        # pylint: disable=too-many-arguments
+        buf = self.buf
+        if key == -1 and mask == 0xFF:
+            buf[index : index + count] = src_buf[src_index : src_index + count]
+        elif key == -1:
+            for i in range(count):
+                buf[index + i] = (buf[index + i] & ~mask) | (
+                    src_buf[src_index + i] & mask
+                )
+        elif key == 0:
+            # only lit pixels are drawn
+            for i in range(count):
+                buf[index + i] |= src_buf[src_index + i] & mask
+        else:
+            # only dark pixels are drawn
+            for i in range(count):
+                buf[index + i] &= ~mask | src_buf[src_index + i]
 
     def scroll(self, delta_x, delta_y):
         """shifts framebuf in x and y direction"""
-        if delta_x < 0:
-            shift_x = 0
-            xend = self.width + delta_x
-            dt_x = 1
-        else:
-            shift_x = self.width - 1
-            xend = delta_x - 1
-            dt_x = -1
-        if delta_y < 0:
-            y = 0
-            yend = self.height + delta_y
-            dt_y = 1
-        else:
-            y = self.height - 1
-            yend = delta_y - 1
-            dt_y = -1
-        while y != yend:
-            x = shift_x
-            while x != xend:
-                self.format.set_pixel(
-                    self, x, y, self.format.get_pixel(self, x - delta_x, y - delta_y)
-                )
-                x += dt_x
-            y += dt_y
+        if abs(delta_x) >= self.width or abs(delta_y) >= self.height:
+            # everything scrolled out of view, nothing left to move
+            return
+        self.format.scroll(self, delta_x, delta_y)
 
     # pylint: disable=too-many-arguments
     def text(self, string, x, y, color, *, font_name="font5x8.bin", size=1):
@@ -431,11 +809,14 @@ class FrameBuffer:
                     width, height
                 )
             )
+        if not self.rotation:
+            # image rows map directly onto the buffer, convert them in bulk
+            self.format.image(self, img.tobytes())
+            return
         # Grab all the pixels from the image, faster than getpixel.
         pixels = img.load()
         # Clear buffer
-        for i in range(len(self.buf)):  # pylint: disable=consider-using-enumerate
-            self.buf[i] = 0
+        self.buf[:] = bytes(len(self.buf))
         # Iterate through the pixels
         for x in range(width):  # yes this double loop is slow,
             for y in range(height):  #  but these displays are small!
@@ -58,6 +58,9 @@ SET_PRECHARGE = const(0xD9)
 SET_VCOM_DESEL = const(0xDB)
 SET_CHARGE_PUMP = const(0x8D)
 
+# rough bus cost in bytes of addressing one extra span instead of sending everything
+_SPAN_OVERHEAD = const(18)
+
 
 class _SSD1306(framebuf.FrameBuffer):
     """Base class for SSD1306 display driver"""
@@ -87,6 +90,9 @@ class _SSD1306(framebuf.FrameBuffer):
         # This is necessary because the underlying data buffer is different
         # between I2C and SPI implementations (I2C needs an extra byte).
         self._power = False
+        # Copy of what the display RAM currently holds, so show() only sends what changed
+        self._shadow = bytearray(len(buffer))
+        self._full_refresh = True
         # Parameters for efficient Page Addressing Mode (typical of U8Glib libraries)
         # Important as not all screens appear to support Horizontal Addressing Mode
         if self.page_addressing:
@@ -179,11 +185,16 @@ class _SSD1306(framebuf.FrameBuffer):
         self.write_cmd(SET_SEG_REMAP | (rotate & 1))
         # com output (vertical mirror) is changed immediately
         # you need to call show() for the seg remap to be visible
+        self._full_refresh = True
 
     def write_framebuf(self) -> None:
         """Derived class must implement this"""
         raise NotImplementedError
 
+    def write_framebuf_span(self, page: int, start: int, end: int) -> None:
+        """Derived class must implement this"""
+        raise NotImplementedError
+
     def write_cmd(self, cmd: int) -> None:
         """Derived class must implement this"""
         raise NotImplementedError
@@ -197,11 +208,31 @@ class _SSD1306(framebuf.FrameBuffer):
             time.sleep(0.010)
             self.reset_pin.value = 1
             time.sleep(0.010)
+            # display RAM does not survive a reset
+            self._full_refresh = True
         self.write_cmd(SET_DISP | 0x01)
         self._power = True
 
     def show(self) -> None:
-        """Update the display"""
+        """Update the display, sending only the pages and columns that changed since the
+        last update"""
+        spans = None if self._full_refresh else self._dirty_spans()
+        if spans is None:
+            self._show_all()
+            return
+        for page, start, end in spans:
+            if not self.page_addressing:
+                col_offset = (128 - self.width) // 2 if self.width != 128 else 0
+                self.write_cmd(SET_COL_ADDR)
+                self.write_cmd(col_offset + start)
+                self.write_cmd(col_offset + end - 1)
+                self.write_cmd(SET_PAGE_ADDR)
+                self.write_cmd(page)
+                self.write_cmd(page)
+            self.write_framebuf_span(page, start, end)
+
+    def _show_all(self) -> None:
+        """Send the whole buffer to the display"""
         if not self.page_addressing:
             xpos0 = 0
             xpos1 = self.width - 1
@@ -217,6 +248,40 @@ class _SSD1306(framebuf.FrameBuffer):
             self.write_cmd(0)
             self.write_cmd(self.pages - 1)
         self.write_framebuf()
+        self._shadow[:] = self.buf
+        self._full_refresh = False
+
+    def _dirty_spans(self) -> Optional[list]:
+        """Compare the buffer against what was last sent and return ``(page, start, end)``
+        column spans that need sending, or None if a full update is cheaper"""
+        buf = self.buf
+        shadow = memoryview(self._shadow)
+        width = self.width
+        spans = []
+        cost = 0
+        for page in range(self.pages):
+            start = page * width
+            end = start + width
+            if buf[start:end] == shadow[start:end]:
+                continue
+            if self.page_addressing:
+                # page mode always writes whole page rows
+                spans.append((page, 0, width))
+                cost += width
+                continue
+            while buf[start] == shadow[start]:
+                start += 1
+            while buf[end - 1] == shadow[end - 1]:
+                end -= 1
+            spans.append((page, start - page * width, end - page * width))
+            cost += end - start + _SPAN_OVERHEAD
+        if cost >= len(buf):
+            return None
+        for page, start, end in spans:
+            start += page * width
+            end += page * width
+            shadow[start:end] = buf[start:end]
+        return spans
 
 
 class SSD1306_I2C(_SSD1306):
@@ -246,6 +311,9 @@ class SSD1306_I2C(_SSD1306):
         self.addr = addr
         self.page_addressing = page_addressing
         self.temp = bytearray(2)
+        # Holds the data/command byte followed by one page span for partial updates
+        self.spanbuffer = bytearray(width + 1)
+        self.spanbuffer[0] = 0x40  # Set first byte of data buffer to Co=0, D/C=1
         # Add an extra byte to the data buffer to hold an I2C data/command byte
         # to use hardware-compatible I2C transactions.  A memoryview of the
         # buffer is used to mask this byte from the framebuffer operations
@@ -286,6 +354,25 @@ class SSD1306_I2C(_SSD1306):
             with self.i2c_device:
                 self.i2c_device.write(self.buffer)
 
+    def write_framebuf_span(self, page: int, start: int, end: int) -> None:
+        """Send the columns ``start`` to ``end`` of one page, the display address window
+        must already be set in Horizontal Addressing Mode."""
+        if self.page_addressing:
+            self.write_cmd(0xB0 + page)
+            self.write_cmd(self.page_column_start[0])
+            self.write_cmd(self.page_column_start[1])
+            self.pagebuffer[1:] = self.buffer[
+                1 + self.width * page : 1 + self.width * (page + 1)
+            ]
+            with self.i2c_device:
+                self.i2c_device.write(self.pagebuffer)
+            return
+        count = end - start
+        index = 1 + self.width * page + start
+        self.spanbuffer[1 : 1 + count] = self.buffer[index : index + count]
+        with self.i2c_device:
+            self.i2c_device.write(self.spanbuffer, end=1 + count)
+
 
 # pylint: disable-msg=too-many-arguments
 class SSD1306_SPI(_SSD1306):
@@ -350,3 +437,10 @@ class SSD1306_SPI(_SSD1306):
         self.dc_pin.value = 1
         with self.spi_device as spi:
             spi.write(self.buffer)
+
+    def write_framebuf_span(self, page: int, start: int, end: int) -> None:
+        """write the columns ``start`` to ``end`` of one page via SPI"""
+        index = self.width * page
+        self.dc_pin.value = 1
+        with self.spi_device as spi:
+            spi.write(self.buffer, start=index + start, end=index + end)
@@ -1,15 +1,131 @@
 # import serial
+import time
+import struct
 import asyncio
+import traceback
+import microcontroller
 # from sentry import Sentry
 # from cmd_listener import SerialParser
 # from actuators import Display
-from classes import Display, Sentry, SerialParser
+from classes import Display, Sentry, SerialParser, NVM_FAULT, NVM_FAULT_SIZE
 
 # from motor_test import main
 
 s = Sentry()
 ser = SerialParser()
 
+# fault handling
+FAULT_FORMAT = "<4sfH"       # fault record in nvm: magic, uptime (s), faults since boot, then the text
+FAULT_MAGIC = b"NSFL"
+FAULT_RECORD_INTERVAL = 60   # least seconds between two fault records, each one erases a flash sector
+RESTART_BACKOFF = 0.01       # first restart delay of a failed task (s), doubled on each failure
+MAX_RESTART_BACKOFF = 5
+HEALTHY_TIME = 10            # a task that ran this long before failing restarts with the first delay again
+MAX_FAILURES = 10            # failures in a row before giving up and going to the safe state
+TARGETING_MAX_BACKOFF = 0.05 # the command listener is never given up on, keep its restarts quick
+
+fault_count = 0
+last_fault_record = None     # time.monotonic() of the last fault record written
+
+def log_fault(name, e, force=False):
+    """
+    Report a task failure on the console, to the host and in the fault record in nvm.
+    CIRCUITPY is read-only to code, so nvm keeps the failure and where it was raised for
+    the next boot. Only one fault per FAULT_RECORD_INTERVAL is recorded, so a task that
+    keeps failing doesn't wear out the flash.
+
+    Args:
+        name (string): name of the failed task
+        e (Exception): the exception it raised
+        force (bool, optional): record it even within FAULT_RECORD_INTERVAL of the last one.
+        Defaults to False.
+    """
+    global fault_count, last_fault_record
+    fault_count += 1
+    trace = "".join(traceback.format_exception(e, e, e.__traceback__))
+    print(f"{name} failed:\n{trace}")
+    try:
+        ser.send_line(f"FAULT {name} {e!r}")
+    except Exception:
+        pass
+    now = time.monotonic()
+    if microcontroller.nvm is None or (not force and last_fault_record is not None
+                                       and now - last_fault_record < FAULT_RECORD_INTERVAL):
+        return
+    last_fault_record = now
+    # the innermost frame is the line that raised
+    frames = [line.strip() for line in trace.split("\n") if line.strip().startswith("File")]
+    text = f"{name} {e!r}" + (f" {frames[-1]}" if frames else "")
+    header = struct.pack(FAULT_FORMAT, FAULT_MAGIC, now, min(fault_count, 0xFFFF))
+    record = header + text.encode("utf-8")[:NVM_FAULT_SIZE - len(header)]
+    microcontroller.nvm[NVM_FAULT:NVM_FAULT + NVM_FAULT_SIZE] = record + bytes(NVM_FAULT_SIZE - len(record))
+
+def last_fault():
+    """
+    Read the fault record log_fault left in nvm
+
+    Returns:
+        string: the recorded fault with its uptime and fault count, or None if there is none
+    """
+    if microcontroller.nvm is None:
+        return None
+    size = struct.calcsize(FAULT_FORMAT)
+    record = bytes(microcontroller.nvm[NVM_FAULT:NVM_FAULT + NVM_FAULT_SIZE])
+    magic, uptime, count = struct.unpack(FAULT_FORMAT, record[:size])
+    if magic != FAULT_MAGIC:
+        return None
+    text = record[size:].split(b"\0")[0].decode("utf-8", "replace")
+    return f"{text} at {uptime:.1f} s, fault {count}"
+
+async def supervise(name, coro_fn, restart=True, stop_motion=True,
+                    max_backoff=MAX_RESTART_BACKOFF, give_up=True, report_healthy=False):
+    """
+    Run a task, restarting it with backoff when it fails. If the task keeps failing it
+    is given up on, which halts the whole sentry: it goes to the safe state and ignores
+    commands until reset.
+
+    Args:
+        name (string): name of the task for the fault log
+        coro_fn (function): returns a new coroutine of the task
+        restart (bool, optional): restart the task after a failure. Defaults to True.
+        stop_motion (bool, optional): the task drives the motors, stop them when it fails
+        and stop the sentry if it can't be restarted. Defaults to True.
+        max_backoff (float, optional): longest restart delay (s). Defaults to MAX_RESTART_BACKOFF.
+        give_up (bool, optional): give up after MAX_FAILURES failures in a row. Defaults to True.
+        report_healthy (bool, optional): coro_fn takes a function the task calls when it made
+        progress, which resets the backoff and the failure count. Defaults to False.
+    """
+    backoff = RESTART_BACKOFF
+    failures = 0
+
+    def healthy():
+        nonlocal backoff, failures
+        backoff = RESTART_BACKOFF
+        failures = 0
+
+    while True:
+        started = time.monotonic()
+        try:
+            await (coro_fn(healthy) if report_healthy else coro_fn())
+            return
+        except Exception as e:
+            # stop first, writing the fault log to flash takes a while
+            if stop_motion:
+                s.safe_state()
+            log_fault(name, e)
+            if time.monotonic() - started > HEALTHY_TIME:
+                healthy()
+            failures += 1
+            if not restart:
+                return
+            if give_up and failures >= MAX_FAILURES:
+                s.halt()
+                if stop_motion:
+                    raise
+                return
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, max_backoff)
+
 async def run_serial_test(ser:SerialParser, display:Display):
     while True:
         ser.test_serial_echo(display)
@@ -18,7 +134,20 @@ async def run_serial_test(ser:SerialParser, display:Display):
 
 
 async def sentry_loop():
-    led_task = asyncio.create_task(s.blink_led(0.08))
+    # tell the host about the last failure before this boot
+    fault = last_fault()
+    if fault is not None:
+        print(f"last fault: {fault}")
+        ser.send_line(f"LAST FAULT {fault}")
+
+    # a warm boot picks up the angles saved before reset, otherwise find zero again
+    if not s.restore_position():
+        await s.home()
+
+    led_task = asyncio.create_task(supervise("led", lambda: s.blink_led(0.08), stop_motion=False))
+    # motion and serial are up, bring the display up in the background
+    display_task = asyncio.create_task(supervise("display", s.display.start, restart=False,
+                                                 stop_motion=False))
 
 
     # op_control_task = s.run_op_control(ser)
@@ -28,9 +157,14 @@ async def sentry_loop():
     # test_serial_task = run_serial_test(ser, s.display)
     # await asyncio.gather(led_task, test_serial_task)
 
-    targetting_control_task = s.run_targeting(ser)
-    cmd_exection_task = s.execute_cmds()
-    await asyncio.gather(led_task, targetting_control_task, cmd_exection_task)  # Don't forget "await"!
+    targetting_control_task = supervise("targeting", lambda healthy: s.run_targeting(ser, healthy),
+                                        stop_motion=False, max_backoff=TARGETING_MAX_BACKOFF,
+                                        give_up=False, report_healthy=True)
+    cmd_exection_task = supervise("execute", lambda: s.execute_cmds(ser))
+    limits_task = supervise("limits", s.run_limits)
+    position_saver_task = supervise("position saver", s.run_position_saver, stop_motion=False)
+    await asyncio.gather(led_task, targetting_control_task, cmd_exection_task, limits_task,
+                         position_saver_task)  # Don't forget "await"!
 
 
 async def main():
@@ -40,8 +174,13 @@ async def main():
 
 try:
     asyncio.run(main())
-except:
+except BaseException as e:
+    # a task gave up or the loop itself failed: stop all outputs and release the steppers
+    s.safe_state()
+    s.stepper_hold.release()
     print("steppers stopped")
-    s.stepper_hold.toggle()
+    if not isinstance(e, Exception):
+        raise  # ctrl-C, drop to the REPL
+    log_fault("main", e, force=True)
     while True:
-        pass
\ No newline at end of file
+        time.sleep(1)
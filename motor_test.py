@@ -1,23 +1,23 @@
 # load standard Python modules
 import time
 import asyncio
-# load CircuitPython modules
-import board
 # load custom modules
 from actuators import Trigger, StepperHold
 from PicoMotorLib import A4988Nema
 from sentry import Trigger
+from classes import load_config
 
 ### STARTUP ###
 # define motor control pins
-STEP_RES       = (board.GP20, board.GP21, board.GP22)
-PAN_STP        = board.GP17
-PAN_DIR        = board.GP16
-TILT_STP       = board.GP13
-TILT_DIR       = board.GP12
-HOLD           = board.GP11
-TRIGGER_SERVO  = board.GP15
-FLYWHEEL_RELAY = board.GP28
+pins = load_config().pins
+STEP_RES       = (pins.ms1, pins.ms2, pins.ms3)
+PAN_STP        = pins.pan_step
+PAN_DIR        = pins.pan_dir
+TILT_STP       = pins.tilt_step
+TILT_DIR       = pins.tilt_dir
+HOLD           = pins.hold
+TRIGGER_SERVO  = pins.trigger_servo
+FLYWHEEL_RELAY = pins.flywheel_relay
 
 # define motor control objects
 pan_stepper  = A4988Nema(direction_pin=PAN_DIR, step_pin=PAN_STP, mode_pins=STEP_RES)
@@ -212,6 +212,7 @@ class Sentry:
                     if cmd.state == True:
                         print("FIRE")
                         asyncio.create_task(self.sentry_trigger.fire())
+                        self.cmds.discard(cmd)  # fire once per FIRE, not on every pass
                         # await asyncio.gather(firetask)
                         # await asyncio.sleep(0)
                         # firetask.cancel()
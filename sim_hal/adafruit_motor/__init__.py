@@ -0,0 +1,3 @@
+"""
+Stand-in for the adafruit_motor library, whose lib/ copy is only shipped as CircuitPython .mpy
+"""
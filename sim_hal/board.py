@@ -0,0 +1,14 @@
+"""
+Stand-in for the CircuitPython board module of the Raspberry Pi Pico
+"""
+from microcontroller import Pin
+
+for _n in range(29):
+    globals()["GP{}".format(_n)] = Pin("GP{}".format(_n))
+LED = GP25
+SMPS_MODE = GP23
+VBUS_SENSE = GP24
+A0 = GP26
+A1 = GP27
+A2 = GP28
+A3 = VOLTAGE_MONITOR = Pin("GP29")
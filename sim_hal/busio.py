@@ -0,0 +1,36 @@
+"""
+Stand-in for the CircuitPython busio module, an I2C bus with nothing attached
+"""
+
+
+class I2C:
+    def __init__(self, scl, sda, *, frequency=100000, timeout=255):
+        """
+        Simulated I2C bus
+
+        Args:
+            scl (Pin): clock pin
+            sda (Pin): data pin
+        """
+        self.scl = scl
+        self.sda = sda
+        self.frequency = frequency
+        self._locked = False
+
+    def try_lock(self):
+        if self._locked:
+            return False
+        self._locked = True
+        return True
+
+    def unlock(self):
+        self._locked = False
+
+    def scan(self):
+        return []
+
+    def writeto(self, address, buffer, *, start=0, end=None):
+        pass
+
+    def deinit(self):
+        pass
@@ -0,0 +1,73 @@
+"""
+Stand-in for the CircuitPython digitalio module. Inputs read their pull, or False if
+there is none, until a test sets value.
+"""
+
+
+class Direction:
+    INPUT = "INPUT"
+    OUTPUT = "OUTPUT"
+
+
+class Pull:
+    UP = "UP"
+    DOWN = "DOWN"
+
+
+class DriveMode:
+    PUSH_PULL = "PUSH_PULL"
+    OPEN_DRAIN = "OPEN_DRAIN"
+
+
+class DigitalInOut:
+    def __init__(self, pin):
+        """
+        Simulated digital pin, starts as an input without pull like the real one
+
+        Args:
+            pin (Pin): pin to control
+        """
+        self.pin = pin
+        self.value = False
+        self._direction = Direction.INPUT
+        self._pull = None
+
+    @property
+    def direction(self):
+        return self._direction
+
+    @direction.setter
+    def direction(self, direction):
+        if direction == Direction.OUTPUT:
+            self.switch_to_output()
+        else:
+            self.switch_to_input()
+
+    @property
+    def pull(self):
+        return self._pull
+
+    @pull.setter
+    def pull(self, pull):
+        if self._direction == Direction.OUTPUT:
+            raise AttributeError("Pull not used when direction is output.")
+        self._pull = pull
+        self.value = pull == Pull.UP
+
+    def switch_to_output(self, value=False, drive_mode=DriveMode.PUSH_PULL):
+        self._direction = Direction.OUTPUT
+        self._pull = None
+        self.value = value
+
+    def switch_to_input(self, pull=None):
+        self._direction = Direction.INPUT
+        self.pull = pull
+
+    def deinit(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.deinit()
@@ -0,0 +1,185 @@
+"""
+Stand-in for the CircuitPython displayio module. Bitmaps hold their pixels so labels can
+be rendered and inspected, displays only keep the group they show.
+"""
+
+
+def release_displays():
+    pass
+
+
+class Bitmap:
+    def __init__(self, width, height, value_count):
+        """
+        Simulated bitmap
+
+        Args:
+            width (int): width in pixels
+            height (int): height in pixels
+            value_count (int): number of distinct pixel values
+        """
+        self.width = width
+        self.height = height
+        self.value_count = value_count
+        self._pixels = bytearray(width * height)
+
+    def _index(self, key):
+        if isinstance(key, tuple):
+            x, y = key
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                raise IndexError("pixel out of range")
+            return y * self.width + x
+        return key
+
+    def __getitem__(self, key):
+        return self._pixels[self._index(key)]
+
+    def __setitem__(self, key, value):
+        if not 0 <= value < self.value_count:
+            raise ValueError("pixel value out of range")
+        self._pixels[self._index(key)] = value
+
+    def fill(self, value):
+        self._pixels[:] = bytes([value]) * len(self._pixels)
+
+    def dirty(self, x1=0, y1=0, x2=-1, y2=-1):
+        pass
+
+
+class Palette:
+    def __init__(self, color_count, *, dither=False):
+        """ Simulated palette of color_count colors """
+        self._colors = [0] * color_count
+        self._transparent = set()
+
+    def __len__(self):
+        return len(self._colors)
+
+    def __getitem__(self, index):
+        return self._colors[index]
+
+    def __setitem__(self, index, color):
+        self._colors[index] = color
+
+    def make_transparent(self, index):
+        self._transparent.add(index)
+
+    def make_opaque(self, index):
+        self._transparent.discard(index)
+
+    def is_transparent(self, index):
+        return index in self._transparent
+
+
+class TileGrid:
+    def __init__(self, bitmap, *, pixel_shader, width=1, height=1, tile_width=None,
+                 tile_height=None, default_tile=0, x=0, y=0):
+        """ Simulated tile grid showing bitmap with pixel_shader """
+        self.bitmap = bitmap
+        self.pixel_shader = pixel_shader
+        self.width = width
+        self.height = height
+        self.tile_width = bitmap.width if tile_width is None else tile_width
+        self.tile_height = bitmap.height if tile_height is None else tile_height
+        self.x = x
+        self.y = y
+        self.hidden = False
+        self.flip_x = False
+        self.flip_y = False
+        self.transpose_xy = False
+        self._tiles = [default_tile] * (width * height)
+
+    def __getitem__(self, index):
+        return self._tiles[index]
+
+    def __setitem__(self, index, tile):
+        self._tiles[index] = tile
+
+
+class Group:
+    def __init__(self, *, scale=1, x=0, y=0):
+        """ Simulated group of layers """
+        # set behind the property, like the native __init__ does, so subclasses can override it
+        self._scale = scale
+        self.x = x
+        self.y = y
+        self.hidden = False
+        self._layers = []
+
+    @property
+    def scale(self):
+        return self._scale
+
+    @scale.setter
+    def scale(self, scale):
+        self._scale = scale
+
+    def append(self, layer):
+        self._layers.append(layer)
+
+    def insert(self, index, layer):
+        self._layers.insert(index, layer)
+
+    def remove(self, layer):
+        self._layers.remove(layer)
+
+    def pop(self, index=-1):
+        return self._layers.pop(index)
+
+    def index(self, layer):
+        return self._layers.index(layer)
+
+    def __len__(self):
+        return len(self._layers)
+
+    def __getitem__(self, index):
+        return self._layers[index]
+
+    def __setitem__(self, index, layer):
+        self._layers[index] = layer
+
+    def __delitem__(self, index):
+        del self._layers[index]
+
+    def __contains__(self, layer):
+        return layer in self._layers
+
+
+class I2CDisplay:
+    def __init__(self, i2c_bus, *, device_address, reset=None):
+        """ Simulated I2C display bus """
+        self.i2c_bus = i2c_bus
+        self.device_address = device_address
+
+    def send(self, command, data):
+        pass
+
+
+class FourWire:
+    def __init__(self, spi_bus, *, command, chip_select, reset=None, baudrate=24000000):
+        """ Simulated SPI display bus """
+        self.spi_bus = spi_bus
+
+
+class Display:
+    def __init__(self, display_bus, init_sequence, *, width, height, **kwargs):
+        """ Simulated display, keeps the group it shows """
+        self.bus = display_bus
+        self.width = width
+        self.height = height
+        self.root_group = None
+        self.auto_refresh = True
+        self.brightness = 1.0
+        self.rotation = kwargs.get("rotation", 0)
+
+    def show(self, group):
+        self.root_group = group
+
+    def refresh(self, *, target_frames_per_second=None, minimum_frames_per_second=0):
+        return True
+
+    def sleep(self):
+        pass
+
+    def wake(self):
+        pass
@@ -0,0 +1,26 @@
+"""
+Stand-in for the CircuitPython fontio module. BuiltinFont has the 6x12 cells of the
+built in font with every glyph left blank.
+"""
+from collections import namedtuple
+
+import displayio
+
+Glyph = namedtuple("Glyph", ["bitmap", "tile_index", "width", "height", "dx", "dy", "shift_x", "shift_y"])
+
+
+class FontProtocol:
+    """ What labels expect of a font, only used for type hints """
+
+
+class BuiltinFont(FontProtocol):
+    def __init__(self):
+        """ Simulated fixed width font """
+        self.bitmap = displayio.Bitmap(6, 12, 2)
+        self._glyph = Glyph(self.bitmap, 0, 6, 12, 0, 0, 6, 0)
+
+    def get_bounding_box(self):
+        return (6, 12)
+
+    def get_glyph(self, codepoint):
+        return self._glyph
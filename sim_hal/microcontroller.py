@@ -0,0 +1,22 @@
+"""
+Stand-in for the CircuitPython microcontroller module so the project runs on a PC.
+nvm is plain RAM, so it only survives as long as the process.
+"""
+
+
+class Pin:
+    def __init__(self, name):
+        """
+        Simulated GPIO pin, only carries its name
+
+        Args:
+            name (string): pin name, e.g. "GP15"
+        """
+        self.name = name
+
+    def __repr__(self):
+        return "board." + self.name
+
+
+# the RP2040 port has 4 kB of flash set aside for nvm
+nvm = bytearray(4096)
@@ -0,0 +1,55 @@
+"""
+Stand-in for the CircuitPython pwmio module, keeps the settings without driving anything
+"""
+
+
+class PWMOut:
+    def __init__(self, pin, *, duty_cycle=0, frequency=500, variable_frequency=False):
+        """
+        Simulated PWM output
+
+        Args:
+            pin (Pin): pin to output on
+            duty_cycle (int, optional): 16 bit duty cycle. Defaults to 0.
+            frequency (int, optional): frequency in Hz. Defaults to 500.
+            variable_frequency (bool, optional): allow frequency changes. Defaults to False.
+        """
+        self.pin = pin
+        self._variable_frequency = variable_frequency
+        self._frequency = 0
+        self._set_frequency(frequency)
+        self.duty_cycle = duty_cycle
+
+    @property
+    def duty_cycle(self):
+        return self._duty_cycle
+
+    @duty_cycle.setter
+    def duty_cycle(self, duty_cycle):
+        if not 0 <= duty_cycle <= 0xFFFF:
+            raise ValueError("duty_cycle must be 0-65535")
+        self._duty_cycle = duty_cycle
+
+    @property
+    def frequency(self):
+        return self._frequency
+
+    @frequency.setter
+    def frequency(self, frequency):
+        if not self._variable_frequency:
+            raise AttributeError("PWM frequency not writable when variable_frequency is False")
+        self._set_frequency(frequency)
+
+    def _set_frequency(self, frequency):
+        if frequency <= 0:
+            raise ValueError("Invalid PWM frequency")
+        self._frequency = frequency
+
+    def deinit(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.deinit()
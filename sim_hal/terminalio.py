@@ -0,0 +1,6 @@
+"""
+Stand-in for the CircuitPython terminalio module
+"""
+from fontio import BuiltinFont
+
+FONT = BuiltinFont()
@@ -0,0 +1,50 @@
+"""
+Stand-in for the CircuitPython usb_cdc module. The host side of a channel is simulated
+with feed() for bytes sent to the Pico and the sent list for bytes it wrote back.
+"""
+
+
+class Serial:
+    def __init__(self):
+        """ Simulated USB CDC channel """
+        self.timeout = 1
+        self.write_timeout = None
+        self.sent = []
+        self._input = bytearray()
+
+    def feed(self, data):
+        """ Queue bytes as if the host sent them """
+        self._input.extend(data)
+
+    @property
+    def in_waiting(self):
+        return len(self._input)
+
+    @property
+    def connected(self):
+        return True
+
+    def read(self, size=1):
+        data = bytes(self._input[:size])
+        self._input = self._input[size:]
+        return data
+
+    def readline(self, size=-1):
+        end = self._input.find(b"\n") + 1 or len(self._input)
+        if 0 <= size < end:
+            end = size
+        return self.read(end)
+
+    def write(self, data):
+        self.sent.append(bytes(data))
+        return len(data)
+
+    def reset_input_buffer(self):
+        self._input = bytearray()
+
+    def reset_output_buffer(self):
+        pass
+
+
+console = Serial()
+data = Serial()
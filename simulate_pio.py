@@ -0,0 +1,215 @@
+"""
+Stand-in for the CircuitPython rp2pio module so PIO driven code can run on a PC.
+Interprets the PIO instructions used by this project in simulated time: every call
+first runs the state machine for the cycles that passed on the host clock.
+"""
+import time
+
+FIFO_DEPTH = 4
+MASK = 0xFFFFFFFF
+
+
+class StateMachine:
+    def __init__(self, program, frequency, *, first_set_pin=None, set_pin_count=1,
+                 initial_set_pin_state=0, initial_set_pin_direction=0x1F, **kwargs):
+        """
+        Simulated PIO state machine. Supports JMP, PUSH/PULL, MOV and SET on the set pins,
+        with delays and the default wrap over the whole program.
+
+        Args:
+            program (array): assembled 16 bit PIO instructions
+            frequency (int): state machine clock in Hz
+            first_set_pin (Pin, optional): first pin driven by SET. Only recorded.
+            set_pin_count (int, optional): number of SET pins. Defaults to 1.
+            initial_set_pin_state (int, optional): starting value of the SET pins. Defaults to 0.
+        """
+        self.program = list(program)
+        self.frequency = frequency
+        self.first_set_pin = first_set_pin
+        self._set_mask = (1 << set_pin_count) - 1
+        self.pins = initial_set_pin_state & self._set_mask
+        self.rising_edges = 0     # rising edges seen on the first SET pin, for checking step counts
+
+        self._tx = []
+        self._rx = []
+        self._reset()
+        self._running = True
+        self._last = time.monotonic_ns()
+
+    def _reset(self):
+        self.pc = 0
+        self.x = self.y = self.isr = self.osr = 0
+        self._delay = 0           # delay cycles still owed by the last instruction
+
+    def _advance(self):
+        """
+        Run the state machine for the host time that passed since the last call
+        """
+        now = time.monotonic_ns()
+        if self._running:
+            self._run_cycles((now - self._last) * self.frequency // 1_000_000_000)
+        self._last = now
+
+    def _run_cycles(self, budget):
+        if self._delay:
+            spent = min(budget, self._delay)
+            self._delay -= spent
+            budget -= spent
+        while budget > 0:
+            word = self.program[self.pc]
+            if word >> 13 == 0 and (word >> 5) & 7 == 4 and word & 0x1F == self.pc:
+                # "jmp y--, self" is a busy wait, take it in one go
+                if budget <= self.y:
+                    self.y -= budget
+                    return
+                budget -= self.y + 1
+                self.y = MASK
+                self.pc = (self.pc + 1) % len(self.program)
+                continue
+            if not self._execute(word):
+                return    # stalled on a FIFO
+            budget -= 1
+            delay = (word >> 8) & 0x1F
+            spent = min(budget, delay)
+            self._delay = delay - spent
+            budget -= spent
+
+    def _execute(self, word, blocking=True):
+        """
+        Execute one instruction
+
+        Returns:
+            bool: False if the instruction stalled and has to be retried
+        """
+        opcode = word >> 13
+        next_pc = (self.pc + 1) % len(self.program)
+        if opcode == 0:    # JMP
+            cond = (word >> 5) & 7
+            if cond == 0:
+                taken = True
+            elif cond == 1:
+                taken = self.x == 0
+            elif cond == 2:
+                taken = self.x != 0
+                self.x = (self.x - 1) & MASK
+            elif cond == 3:
+                taken = self.y == 0
+            elif cond == 4:
+                taken = self.y != 0
+                self.y = (self.y - 1) & MASK
+            elif cond == 5:
+                taken = self.x != self.y
+            else:
+                raise NotImplementedError("JMP condition {}".format(cond))
+            if taken:
+                next_pc = word & 0x1F
+        elif opcode == 4 and word & 0x80:    # PULL
+            if self._tx:
+                self.osr = self._tx.pop(0)
+            elif blocking and word & 0x20:
+                return False
+            else:
+                self.osr = self.x
+        elif opcode == 4:    # PUSH
+            if len(self._rx) < FIFO_DEPTH:
+                self._rx.append(self.isr)
+            elif blocking and word & 0x20:
+                return False
+            self.isr = 0
+        elif opcode == 5:    # MOV
+            src = word & 7
+            if src == 1:
+                value = self.x
+            elif src == 2:
+                value = self.y
+            elif src == 3:
+                value = 0
+            elif src == 6:
+                value = self.isr
+            elif src == 7:
+                value = self.osr
+            else:
+                raise NotImplementedError("MOV source {}".format(src))
+            op = (word >> 3) & 3
+            if op == 1:
+                value = ~value & MASK
+            dest = (word >> 5) & 7
+            if dest == 1:
+                self.x = value
+            elif dest == 2:
+                self.y = value
+            elif dest == 6:
+                self.isr = value
+            elif dest == 7:
+                self.osr = value
+            else:
+                raise NotImplementedError("MOV destination {}".format(dest))
+        elif opcode == 7:    # SET
+            dest = (word >> 5) & 7
+            data = word & 0x1F
+            if dest == 0:
+                if data & 1 and not self.pins & 1:
+                    self.rising_edges += 1
+                self.pins = data & self._set_mask
+            elif dest == 1:
+                self.x = data
+            elif dest == 2:
+                self.y = data
+            else:
+                raise NotImplementedError("SET destination {}".format(dest))
+        else:
+            raise NotImplementedError("PIO opcode {}".format(opcode))
+        self.pc = next_pc
+        return True
+
+    def _wait(self, ready):
+        # block like the hardware FIFOs do, letting host time run the state machine
+        while not ready():
+            time.sleep(0.0005)
+            self._advance()
+
+    @property
+    def in_waiting(self):
+        """ Number of words in the RX FIFO """
+        self._advance()
+        return len(self._rx)
+
+    def write(self, buffer):
+        """ Write words to the TX FIFO, blocking while it is full """
+        for word in buffer:
+            self._advance()
+            self._wait(lambda: len(self._tx) < FIFO_DEPTH)
+            self._tx.append(word & MASK)
+
+    def readinto(self, buffer):
+        """ Read words from the RX FIFO, blocking until enough arrive """
+        for i in range(len(buffer)):
+            self._advance()
+            self._wait(lambda: self._rx)
+            buffer[i] = self._rx.pop(0)
+
+    def run(self, instructions):
+        """ Execute instructions immediately, FIFO operations never block """
+        self._advance()
+        pc = self.pc
+        for word in instructions:
+            self._execute(word, blocking=False)
+            if word >> 13:      # only jumps move the program counter
+                self.pc = pc
+            pc = self.pc
+
+    def stop(self):
+        self._advance()
+        self._running = False
+
+    def restart(self):
+        """ Reset the registers and start from the top of the program, the FIFOs keep their words """
+        self._advance()
+        self._reset()
+        self._running = True
+
+    def clear_rxfifo(self):
+        self._rx = []
+
+    def deinit(self):
+        self._running = False